@@ -0,0 +1,164 @@
+"""Micro-benchmarks for case_conversion.
+
+Times every public converter and case_parse.parse_case over short and long
+identifiers in every input case, with and without Unicode characters and
+acronym detection.
+
+Usage:
+    python benchmarks/bench.py                        # print results
+    python benchmarks/bench.py -o results.json        # save results
+    python benchmarks/bench.py -b baseline.json       # flag regressions
+    python benchmarks/bench.py -b baseline.json -t 0.2 -o results.json
+
+With --baseline, exits with status 1 if any benchmark is slower than the
+baseline by more than the threshold (a fraction, 0.1 = 10% by default).
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import case_conversion  # noqa: E402
+from case_conversion import case_parse  # noqa: E402
+
+CONVERTERS = [
+    'camelcase',
+    'pascalcase',
+    'snakecase',
+    'dashcase',
+    'kebabcase',
+    'spinalcase',
+    'constcase',
+    'screaming_snakecase',
+    'dotcase',
+    'separate_words',
+    'slashcase',
+    'backslashcase',
+]
+
+ACRONYMS = ['HTTP', 'JSON', 'UUID', 'API', 'URL', u'HÉÉP']
+
+# Input shapes, written in every case. Each is a list of words.
+SHAPES = {
+    'short': ['user', 'id'],
+    'long': ['customer', 'billing', 'address', 'http', 'json', 'payload',
+             'uuid', 'line', 'two', 'postal', 'code', 'override', 'value'],
+    'unicode': [u'fóo', u'bär', u'héép', u'strîng'],
+}
+
+INPUT_CASES = {
+    'camel': lambda ws: ws[0] + ''.join(w.capitalize() for w in ws[1:]),
+    'pascal': lambda ws: ''.join(w.capitalize() for w in ws),
+    'snake': lambda ws: '_'.join(ws),
+    'dash': lambda ws: '-'.join(ws),
+    'const': lambda ws: '_'.join(w.upper() for w in ws),
+    'dot': lambda ws: '.'.join(ws),
+    'separate_words': lambda ws: ' '.join(ws),
+    'slash': lambda ws: '/'.join(ws),
+    'backslash': lambda ws: '\\'.join(ws),
+    'acronym_run': lambda ws: ''.join(w.upper() if len(w) <= 4
+                                      else w.capitalize() for w in ws),
+}
+
+
+def benchmarks():
+    """Yield (name, callable) pairs for every benchmark."""
+    for shape, words in sorted(SHAPES.items()):
+        for input_case, make in sorted(INPUT_CASES.items()):
+            text = make(words)
+            for acronyms in (None, ACRONYMS):
+                suffix = '{}/{}/{}'.format(
+                    shape, input_case, 'acronyms' if acronyms else 'plain')
+                yield ('parse_case/' + suffix,
+                       lambda t=text, a=acronyms: case_parse.parse_case(t, a))
+                for name in CONVERTERS:
+                    converter = getattr(case_conversion, name)
+                    yield (name + '/' + suffix,
+                           lambda c=converter, t=text, a=acronyms: c(t, a))
+
+
+def time_call(func, min_time, repeat):
+    """Return the best time per call of func, in seconds."""
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 10
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run(min_time, repeat, pattern=None):
+    results = {}
+    for name, func in benchmarks():
+        if pattern and pattern not in name:
+            continue
+        results[name] = time_call(func, min_time, repeat)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print a comparison against baseline; return names of regressions."""
+    regressions = []
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        ratio = results[name] / baseline[name]
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print('{:<60} {:>9.3f}us {:>9.3f}us {:>6.2f}x{}'.format(
+            name, baseline[name] * 1e6, results[name] * 1e6, ratio, flag))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmark the case_conversion converters.')
+    parser.add_argument('-o', '--output',
+                        help='write results as JSON to this file')
+    parser.add_argument('-b', '--baseline',
+                        help='JSON results to compare against')
+    parser.add_argument('-t', '--threshold', type=float, default=0.1,
+                        help='slowdown fraction flagged as a regression')
+    parser.add_argument('-k', '--filter',
+                        help='only run benchmarks whose name contains this')
+    parser.add_argument('--min-time', type=float, default=0.02,
+                        help='minimum seconds per timing run')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='timing runs per benchmark (best is kept)')
+    args = parser.parse_args(argv)
+
+    results = run(args.min_time, args.repeat, args.filter)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'implementation': platform.python_implementation(),
+                'timestamp': time.time(),
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print('{} regression(s) beyond {:.0%}'.format(
+                len(regressions), args.threshold))
+            return 1
+    elif not args.output:
+        for name in sorted(results):
+            print('{:<60} {:>9.3f}us'.format(name, results[name] * 1e6))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
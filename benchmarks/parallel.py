@@ -0,0 +1,78 @@
+"""Scaling benchmark for convert_many's process pool mode.
+
+Converts the same batch of distinct identifiers in-process and with 1 to N
+worker processes, and reports throughput and speedup for each.
+
+Usage:
+    python benchmarks/parallel.py
+    python benchmarks/parallel.py -n 8 --count 1000000 --chunk-size 20000
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from case_conversion import convert_many  # noqa: E402
+
+ACRONYMS = ['HTTP', 'JSON', 'UUID', 'API', 'URL']
+
+
+def identifiers(count):
+    """Return count distinct identifiers in assorted cases."""
+    shapes = [
+        'customerBillingAddress{}HTTPStatus',
+        'Order{}LineItemJSON',
+        'warehouse_table_{}_uuid_column',
+        'EVENT_{}_API_PAYLOAD_URL',
+    ]
+    return [shapes[i % len(shapes)].format(i) for i in range(count)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Measure convert_many scaling over worker processes.')
+    parser.add_argument('-n', '--max-processes', type=int,
+                        default=multiprocessing.cpu_count(),
+                        help='largest number of worker processes to try')
+    parser.add_argument('--count', type=int, default=400000,
+                        help='number of identifiers to convert')
+    parser.add_argument('--chunk-size', type=int, default=10000,
+                        help='identifiers sent to a worker at a time')
+    parser.add_argument('--style', default='snake')
+    parser.add_argument('-o', '--output',
+                        help='write results as JSON to this file')
+    args = parser.parse_args(argv)
+
+    texts = identifiers(args.count)
+    results = {}
+    for processes in [None] + list(range(1, args.max_processes + 1)):
+        seconds = min(timeit.repeat(
+            lambda: convert_many(texts, args.style, ACRONYMS,
+                                 processes=processes,
+                                 chunk_size=args.chunk_size),
+            number=1, repeat=3))
+        results[processes or 0] = seconds
+
+    serial = results[0]
+    print('{:>9} {:>9} {:>12} {:>8}'.format(
+        'processes', 'seconds', 'items/s', 'speedup'))
+    for processes in sorted(results):
+        seconds = results[processes]
+        print('{:>9} {:>9.3f} {:>12.0f} {:>7.2f}x'.format(
+            processes or 'serial', seconds, args.count / seconds,
+            serial / seconds))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'count': args.count, 'chunk_size': args.chunk_size,
+                       'style': args.style, 'seconds': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Concurrency benchmark for convert_many's thread pool mode.
+
+Converts the same batch of identifiers in-process and with 1 to 16 threads
+sharing one converter and the parse cache, and reports throughput and
+speedup for each. Threads only scale on free-threaded Python builds; with
+the GIL this measures the overhead of the locks instead.
+
+Usage:
+    python benchmarks/threads.py
+    python benchmarks/threads.py -n 32 --count 1000000 --distinct 5000
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from case_conversion import convert_many, case_parse  # noqa: E402
+from parallel import ACRONYMS, identifiers  # noqa: E402
+
+
+def gil_enabled():
+    """Return whether the running interpreter has the GIL enabled."""
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled() if is_gil_enabled else True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Measure convert_many scaling over worker threads.')
+    parser.add_argument('-n', '--max-threads', type=int, default=16,
+                        help='largest number of worker threads to try')
+    parser.add_argument('--count', type=int, default=400000,
+                        help='number of identifiers to convert')
+    parser.add_argument('--distinct', type=int, default=20000,
+                        help='number of distinct identifiers among them')
+    parser.add_argument('--chunk-size', type=int, default=2000,
+                        help='identifiers handed to a thread at a time')
+    parser.add_argument('--parse-cache', type=int, default=4096,
+                        help='parse_case cache size (0 disables)')
+    parser.add_argument('--style', default='snake')
+    parser.add_argument('-o', '--output',
+                        help='write results as JSON to this file')
+    args = parser.parse_args(argv)
+
+    distinct = identifiers(args.distinct)
+    texts = [distinct[i % args.distinct] for i in range(args.count)]
+    case_parse.set_cache_size(args.parse_cache)
+
+    counts = [None]
+    threads = 1
+    while threads <= args.max_threads:
+        counts.append(threads)
+        threads *= 2
+
+    results = {}
+    for threads in counts:
+        seconds = min(timeit.repeat(
+            lambda: convert_many(texts, args.style, ACRONYMS,
+                                 threads=threads,
+                                 chunk_size=args.chunk_size),
+            number=1, repeat=3))
+        results[threads or 0] = seconds
+
+    print('GIL enabled: {}'.format(gil_enabled()))
+    serial = results[0]
+    print('{:>7} {:>9} {:>12} {:>8}'.format(
+        'threads', 'seconds', 'items/s', 'speedup'))
+    for threads in sorted(results):
+        seconds = results[threads]
+        print('{:>7} {:>9.3f} {:>12.0f} {:>7.2f}x'.format(
+            threads or 'serial', seconds, args.count / seconds,
+            serial / seconds))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'count': args.count, 'distinct': args.distinct,
+                       'chunk_size': args.chunk_size, 'style': args.style,
+                       'gil_enabled': gil_enabled(), 'seconds': results},
+                      f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
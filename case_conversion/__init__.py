@@ -1,6 +1,44 @@
 from __future__ import absolute_import
 
+import importlib
+import sys
+
+__version__ = '3.0.0'
+
 from .case_conversion import (
     camelcase, pascalcase, snakecase, dashcase, kebabcase, spinalcase,
     constcase, screaming_snakecase, dotcase, separate_words, slashcase,
-    backslashcase)
+    backslashcase, CaseConverter, compile_converter, convert, is_case,
+    register_style)
+from .case_parse import detect_case
+from .batch import convert_many
+from .keys import convert_keys
+from .json_keys import convert_json_keys
+from .rewrite import rewrite_identifiers
+
+# Exports whose modules import asyncio or sqlite3, which are slow to import
+# (and sqlite3 may be missing), by the module defining them. They are only
+# imported on first use.
+_LAZY = {
+    'PersistentCache': '.persistent',
+    'aconvert_stream': '.aio',
+}
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        try:
+            module = _LAZY[name]
+        except KeyError:
+            raise AttributeError(
+                "module {!r} has no attribute {!r}".format(__name__, name))
+        value = getattr(importlib.import_module(module, __name__), name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(_LAZY))
+else:
+    # No module __getattr__ before Python 3.7.
+    from .persistent import PersistentCache
+    if sys.version_info >= (3, 6):
+        from .aio import aconvert_stream
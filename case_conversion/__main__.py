@@ -0,0 +1,96 @@
+"""Convert identifiers line by line, e.g. python -m case_conversion --to snake.
+
+Reads identifiers from the given files (or stdin), one per line, and writes
+their converted form to stdout. Input is streamed, so memory use doesn't grow
+with the input size.
+"""
+from __future__ import absolute_import
+
+import argparse
+import io
+import sys
+
+from .batch import convert_many
+from . import styles
+
+# Bytes per read from input files, and converted lines per write to stdout.
+READ_BUFFER_SIZE = 1 << 20
+WRITE_CHUNK_LINES = 8192
+
+
+def _read_acronyms(path, encoding):
+    """Return the acronyms listed one per line in path, skipping blanks."""
+    with io.open(path, encoding=encoding) as f:
+        return [line.strip() for line in f
+                if line.strip() and not line.startswith('#')]
+
+
+def _read_lines(paths, stdin, encoding):
+    """Yield lines from each path ('-' is stdin), without line endings."""
+    for path in paths or ['-']:
+        if path == '-':
+            f = stdin
+        else:
+            f = io.open(path, encoding=encoding, buffering=READ_BUFFER_SIZE)
+        try:
+            for line in f:
+                yield line.rstrip('\r\n')
+        finally:
+            if f is not stdin:
+                f.close()
+
+
+def _write_lines(lines, stdout, chunk_lines=WRITE_CHUNK_LINES):
+    """Write lines to stdout, joined into large chunks."""
+    buf = []
+    for line in lines:
+        buf.append(line)
+        if len(buf) >= chunk_lines:
+            buf.append('')
+            stdout.write('\n'.join(buf))
+            buf = []
+    if buf:
+        buf.append('')
+        stdout.write('\n'.join(buf))
+    stdout.flush()
+
+
+def main(argv=None, stdin=None, stdout=None):
+    stdin = sys.stdin if stdin is None else stdin
+    stdout = sys.stdout if stdout is None else stdout
+
+    parser = argparse.ArgumentParser(
+        prog='python -m case_conversion',
+        description='Convert identifiers, one per line, to another case.')
+    parser.add_argument('files', nargs='*', metavar='FILE',
+                        help="input files (default or '-': stdin)")
+    parser.add_argument('--to', required=True, dest='style',
+                        choices=sorted(styles.names()),
+                        help='case style to convert to')
+    parser.add_argument('--acronyms', metavar='FILE',
+                        help='file listing acronyms to detect, one per line')
+    parser.add_argument('--cache', metavar='FILE',
+                        help='keep conversions in this file across runs')
+    parser.add_argument('--encoding', default='utf-8',
+                        help='encoding of the input files (default: utf-8)')
+    args = parser.parse_args(argv)
+
+    acronyms = None
+    if args.acronyms:
+        acronyms = _read_acronyms(args.acronyms, args.encoding)
+
+    lines = _read_lines(args.files, stdin, args.encoding)
+    if args.cache:
+        # Imported here: sqlite3 is slow to import and may be missing.
+        from .persistent import PersistentCache
+        with PersistentCache(args.cache, acronyms) as cache:
+            _write_lines((cache.convert(line, args.style) for line in lines),
+                         stdout)
+    else:
+        _write_lines(convert_many(lines, args.style, acronyms, stream=True),
+                     stdout)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Asyncio streaming conversion (Python 3.6+)."""
+import asyncio
+
+from .case_conversion import CaseConverter
+
+# Marks the end of the source in the read-ahead buffer.
+_DONE = object()
+
+
+async def aconvert_stream(source, style, acronyms=None, batch_size=256,
+                          buffer_size=1024, executor=None,
+                          offload_threshold=None):
+    """Convert strings from an async iterable, yielding them in order.
+
+    Strings are read ahead from source into a buffer of at most buffer_size
+    items, so a slow consumer holds back the source instead of buffering
+    without bound. Buffered strings are converted in micro-batches of up to
+    batch_size, and control is handed back to the event loop after each
+    batch so a long stream never starves other coroutines.
+
+    Args:
+        source: async iterable of strings to convert
+        style: style name, e.g. "snake" or "snakecase"
+        acronyms: a list of acronyms to detect
+        batch_size: maximum number of strings converted at a time
+        buffer_size: maximum number of strings read ahead from source
+        executor: concurrent.futures executor to convert large batches in,
+                  instead of on the event loop
+        offload_threshold: smallest batch sent to executor (default:
+                           batch_size)
+    """
+    convert = CaseConverter(acronyms).converter(style)
+    if offload_threshold is None:
+        offload_threshold = batch_size
+    loop = asyncio.get_event_loop()
+    queue = asyncio.Queue(maxsize=buffer_size)
+    closing = False
+
+    async def produce():
+        try:
+            async for text in source:
+                await queue.put(text)
+        except BaseException as e:
+            # Cancellation by the finally clause below ends the producer.
+            # Anything else, CancelledError included, goes to the consumer,
+            # which would otherwise wait for _DONE forever.
+            if closing:
+                raise
+            await queue.put(e)
+        await queue.put(_DONE)
+
+    def convert_batch(batch):
+        return [convert(text) for text in batch]
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        done = False
+        while not done:
+            batch = [await queue.get()]
+            while len(batch) < batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            # The end of the source (or its error) is always last.
+            error = None
+            if batch[-1] is _DONE:
+                batch.pop()
+                done = True
+            if batch and isinstance(batch[-1], BaseException):
+                error = batch.pop()
+
+            if executor is not None and len(batch) >= offload_threshold:
+                results = await loop.run_in_executor(executor, convert_batch,
+                                                     batch)
+            else:
+                results = convert_batch(batch)
+            for result in results:
+                yield result
+            if error is not None:
+                raise error
+            # Let other coroutines run between batches.
+            await asyncio.sleep(0)
+    finally:
+        closing = True
+        producer.cancel()
@@ -0,0 +1,148 @@
+from collections import deque
+import functools
+import itertools
+import sys
+
+PYTHON = sys.version_info[0]
+
+if 3 == PYTHON:
+    # Python 3 and ST3
+    from .case_conversion import (CaseConverter, _resolve_style,
+                                  register_style)
+else:
+    # Python 2 and ST2
+    from case_conversion import CaseConverter, _resolve_style, register_style
+
+# Converter method of a process pool worker, set up by _init_worker, and
+# the (style, acronyms, cache_size) it was set up with.
+_worker_convert = None
+_worker_setup = None
+
+# Whether ProcessPoolExecutor takes an initializer (Python 3.7+).
+_POOL_INITIALIZER = sys.version_info >= (3, 7)
+
+
+def convert_many(texts, style, acronyms=None, stream=False, cache_size=4096,
+                 processes=None, chunk_size=10000, threads=None):
+    """Convert every string in texts to the given style.
+
+    Acronyms are sanitized once for the whole batch, the converter is looked
+    up once, and repeated strings are served from a shared LRU cache.
+
+    With processes, texts are split into chunks of chunk_size strings that
+    are converted in a pool of worker processes. Each worker sets up the
+    acronyms once, and results are returned in input order.
+
+    With threads, chunks are converted in a pool of threads instead, all
+    sharing one converter and cache. This pays off on free-threaded Python
+    builds; with the GIL, processes scale better.
+
+    Args:
+        texts: iterable of strings to convert
+        style: style name, e.g. "snake" or "snakecase"
+        acronyms: a list of acronyms to detect
+        stream: return a generator instead of a list
+        cache_size: maximum number of memoized conversions (0 disables)
+        processes: number of worker processes (None converts in-process)
+        chunk_size: number of strings sent to a worker at a time
+        threads: number of worker threads (ignored with processes)
+
+    >>> convert_many(["fooBar", "HTTPError"], "snake", acronyms=["HTTP"])
+    ['foo_bar', 'http_error']
+    """
+    style = _resolve_style(style)
+    converter = CaseConverter(acronyms, cache_size)
+    if processes:
+        results = _convert_processes(texts, style, converter.acronyms,
+                                     cache_size, processes, chunk_size)
+    elif threads:
+        results = _convert_threads(texts, converter.converter(style.name),
+                                   threads, chunk_size)
+    else:
+        convert = converter.converter(style.name)
+        results = (convert(text) for text in texts)
+    if stream:
+        return results
+    return list(results)
+
+
+def _chunks(iterable, size):
+    """Yield lists of up to size consecutive items from iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _init_worker(style, acronyms, cache_size):
+    global _worker_convert, _worker_setup
+    # Custom styles aren't registered in a freshly spawned worker yet.
+    register_style(*style)
+    _worker_convert = CaseConverter(acronyms, cache_size).converter(
+        style.name)
+    _worker_setup = (style, acronyms, cache_size)
+
+
+def _convert_chunk(chunk):
+    return [_worker_convert(text) for text in chunk]
+
+
+def _setup_and_convert_chunk(setup, chunk):
+    """_convert_chunk, setting the worker up on first use."""
+    if _worker_setup != setup:
+        _init_worker(*setup)
+    return _convert_chunk(chunk)
+
+
+def _convert_with(convert, chunk):
+    return [convert(text) for text in chunk]
+
+
+def _convert_processes(texts, style, acronyms, cache_size, processes,
+                       chunk_size):
+    """Yield converted texts, converting chunks in a process pool."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    setup = (style, acronyms, cache_size)
+    if _POOL_INITIALIZER:
+        make_pool = functools.partial(ProcessPoolExecutor, processes,
+                                      initializer=_init_worker,
+                                      initargs=setup)
+        convert_chunk = _convert_chunk
+    else:
+        # Every chunk carries the setup instead, and each worker applies
+        # it once.
+        make_pool = functools.partial(ProcessPoolExecutor, processes)
+        convert_chunk = functools.partial(_setup_and_convert_chunk, setup)
+    return _convert_pooled(make_pool, convert_chunk, texts, processes,
+                           chunk_size)
+
+
+def _convert_threads(texts, convert, threads, chunk_size):
+    """Yield converted texts, converting chunks in a thread pool."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    return _convert_pooled(functools.partial(ThreadPoolExecutor, threads),
+                           functools.partial(_convert_with, convert),
+                           texts, threads, chunk_size)
+
+
+def _convert_pooled(make_pool, convert_chunk, texts, workers, chunk_size):
+    """Yield the results of convert_chunk over chunks of texts, in order.
+
+    The pool is only started once the first result is requested.
+    """
+    with make_pool() as pool:
+        # Keep a bounded number of chunks in flight so arbitrarily long
+        # inputs are never read ahead in full.
+        pending = deque()
+        for chunk in _chunks(texts, chunk_size):
+            pending.append(pool.submit(convert_chunk, chunk))
+            if len(pending) > 2 * workers:
+                for result in pending.popleft().result():
+                    yield result
+        while pending:
+            for result in pending.popleft().result():
+                yield result
@@ -0,0 +1,125 @@
+from collections import namedtuple, OrderedDict
+import threading
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+_HAS_MOVE_TO_END = hasattr(OrderedDict, 'move_to_end')
+
+
+def _check_size(maxsize):
+    """Raise ValueError unless maxsize leaves room for at least one entry."""
+    if maxsize < 1:
+        raise ValueError(
+            "Case Conversion: cache size must be at least 1, not {!r}."
+            .format(maxsize))
+
+
+class LRUCache(object):
+    """
+    Mapping of bounded size that evicts the least recently used entry.
+
+    Keeps hit and miss counts, reported by info() in the same shape as
+    functools.lru_cache's cache_info(). One cache can be shared between
+    threads: every operation holds its lock, so it is safe without the GIL
+    too.
+    """
+
+    def __init__(self, maxsize=1024):
+        _check_size(maxsize)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        if _HAS_MOVE_TO_END:
+            self._touch = self._data.move_to_end
+        else:
+            self._touch = self._reinsert
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        """Return the value for key and mark it as most recently used."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._touch(key)
+            self.hits += 1
+            return value
+
+    def _reinsert(self, key):
+        """Mark key as most recently used, on Python 2 (no move_to_end)."""
+        self._data[key] = self._data.pop(key)
+
+    def put(self, key, value):
+        """Store value for key, evicting the oldest entry if full."""
+        with self._lock:
+            self._data.pop(key, None)
+            if len(self._data) >= self.maxsize:
+                self._data.popitem(last=False)
+            self._data[key] = value
+
+    def info(self):
+        """Return hit/miss statistics as a CacheInfo."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize,
+                             len(self._data))
+
+    def clear(self):
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class ShardedLRUCache(object):
+    """
+    LRUCache split into independently locked shards.
+
+    Keys are spread over the shards by hash, so threads working on
+    different keys rarely wait for the same lock. Each shard evicts on its
+    own, which makes eviction order approximate; caches smaller than
+    shards * MIN_SHARD_SIZE use fewer shards, down to a single exact LRU.
+    """
+
+    MIN_SHARD_SIZE = 128
+
+    def __init__(self, maxsize=1024, shards=16):
+        _check_size(maxsize)
+        shards = max(1, min(shards, maxsize // self.MIN_SHARD_SIZE))
+        size, extra = divmod(maxsize, shards)
+        self.maxsize = maxsize
+        self._shards = tuple(LRUCache(size + (i < extra))
+                             for i in range(shards))
+
+    def __len__(self):
+        return sum(len(shard) for shard in self._shards)
+
+    def get(self, key, default=None):
+        """Return the value for key and mark it as most recently used."""
+        shards = self._shards
+        return shards[hash(key) % len(shards)].get(key, default)
+
+    def put(self, key, value):
+        """Store value for key, evicting the oldest entry of its shard."""
+        shards = self._shards
+        shards[hash(key) % len(shards)].put(key, value)
+
+    def info(self):
+        """Return hit/miss statistics of all shards as a CacheInfo."""
+        infos = [shard.info() for shard in self._shards]
+        return CacheInfo(sum(info.hits for info in infos),
+                         sum(info.misses for info in infos),
+                         self.maxsize,
+                         sum(info.currsize for info in infos))
+
+    def clear(self):
+        """Remove all entries and reset statistics."""
+        for shard in self._shards:
+            shard.clear()
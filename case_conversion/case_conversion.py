@@ -1,16 +1,126 @@
+import functools
+import re
 import sys
 
 PYTHON = sys.version_info[0]
 
 if 3 == PYTHON:
     # Python 3 and ST3
-    from . import case_parse
+    from . import case_parse, styles
+    from .cache import ShardedLRUCache
 else:
     # Python 2 and ST2
     import case_parse
+    import styles
+    from cache import ShardedLRUCache
 
+_BINARY = case_parse.BINARY_TYPES
 
-def camelcase(text, acronyms=None):
+
+def _separated(word, sep):
+    """Return a pattern for words separated by single sep characters."""
+    return re.compile(r'{0}(?:{1}{0})*\Z'.format(word, re.escape(sep)))
+
+
+def _not_upper(pattern):
+    """Return a check that text matches pattern and isn't all upper-case.
+
+    All upper-case text is lower-cased before parsing, so it doesn't keep
+    its capitals in camelCase or PascalCase.
+    """
+    return lambda text: pattern.match(text) and not text.isupper()
+
+
+_SNAKE = _separated('[a-z0-9]+', '_')
+_DASH = _separated('[a-z0-9]+', '-')
+_DOT = _separated('[a-z0-9]+', '.')
+_CONST = _separated('[A-Z0-9]+', '_')
+_CAMEL = re.compile(r'[a-z0-9]+(?:[A-Z][a-z0-9]*)*\Z')
+_PASCAL = re.compile(r'(?:[A-Z][a-z0-9]*)+\Z')
+
+# What a non-empty ASCII string already in each style looks like, by style
+# name:
+#   - a pattern every such string matches (the output of the converter
+#     always does), to reject strings in another style without parsing them
+#   - a check that guarantees the converter returns the string unchanged,
+#     or None if there is no cheap one
+#   - whether that check also holds with acronyms (acronyms can regroup and
+#     upper-case words in the styles that keep capitals)
+# Registered styles get an entry when one can be derived, see _canonical().
+_CANONICAL = {
+    'camelcase': (_CAMEL, _not_upper(_CAMEL), False),
+    'pascalcase': (re.compile(r'[A-Z0-9][A-Za-z0-9]*\Z'),
+                   _not_upper(_PASCAL), False),
+    'snakecase': (_SNAKE, _SNAKE.match, True),
+    'dashcase': (_DASH, _DASH.match, True),
+    'constcase': (_CONST, _CONST.match, True),
+    'dotcase': (_DOT, _DOT.match, True),
+    'separate_words': (_separated('[A-Za-z0-9]+', ' '), None, False),
+    'slashcase': (_separated('[A-Za-z0-9]+', '/'), None, False),
+    'backslashcase': (_separated('[A-Za-z0-9]+', '\\'), None, False),
+}
+
+# Words of the styles whose _CANONICAL entry can be derived, by word rule.
+_CANONICAL_WORDS = {'lower': '[a-z0-9]+', 'upper': '[A-Z0-9]+'}
+
+
+def _canonical(style):
+    """Return the _CANONICAL entry for a style, or None if it has none.
+
+    Styles that lower-case or upper-case every word and join them with
+    a separator made of separator characters get an entry like snakecase.
+    """
+    if style.name in _CANONICAL:
+        return _CANONICAL[style.name]
+    word = _CANONICAL_WORDS.get(style.word)
+    if (word is None or style.first_word != style.word or
+            style.preserve_case or not style.separator or
+            any(c.isalnum() for c in style.separator)):
+        return None
+    pattern = _separated(word, style.separator)
+    return pattern, pattern.match, True
+
+
+# Converter functions by style name and alias, see convert().
+_CONVERTERS = {}
+
+
+def _make_converter(style, doc):
+    """Return the converter function for a registered style."""
+    preserve_case = style.preserve_case
+    render = styles.renderer(style)
+    canonical = _canonical(style)
+    check, with_acronyms = canonical[1:] if canonical else (None, False)
+    isascii = case_parse._isascii
+    parse_words = case_parse._parse_case_words
+
+    def converter(text, acronyms=None):
+        if isinstance(text, _BINARY):
+            return _convert_binary(converter, text, acronyms)
+        # Text already in the style is returned as is, without parsing.
+        if check is not None and (with_acronyms or not acronyms) and \
+                isascii(text) and check(text):
+            return text
+        return render(parse_words(text, acronyms, preserve_case))
+
+    # Name the closure like a module-level function, so that pickle (and
+    # with it process pools) finds built-in converters by reference.
+    converter.__name__ = converter.__qualname__ = style.name
+    converter.__module__ = __name__
+    converter.__doc__ = doc
+    return converter
+
+
+def _converter(name, doc):
+    """Return the converter function for built-in style name."""
+    style = styles.get(name)
+    converter = _make_converter(style, doc)
+    _CONVERTERS[name] = converter
+    return converter
+
+
+camelcase = _converter(
+    'camelcase',
     """Return text in camelCase style.
 
     Args:
@@ -22,14 +132,11 @@ def camelcase(text, acronyms=None):
     'helloWorld'
     >>> camelcase("HELLO_HTML_WORLD", True, ["HTML"])
     'helloHTMLWorld'
-    """
-    words, _case, _sep = case_parse.parse_case(text, acronyms)
-    if words:
-        words[0] = words[0].lower()
-    return ''.join(words)
+    """)
 
 
-def pascalcase(text, acronyms=None):
+pascalcase = _converter(
+    'pascalcase',
     """Return text in PascalCase style (aka MixedCase).
 
     Args:
@@ -41,12 +148,11 @@ def pascalcase(text, acronyms=None):
     'HelloWorld'
     >>> pascalcase("HELLO_HTML_WORLD", True, ["HTML"])
     'HelloHTMLWorld'
-    """
-    words, _case, _sep = case_parse.parse_case(text, acronyms)
-    return ''.join(words)
+    """)
 
 
-def snakecase(text, acronyms=None):
+snakecase = _converter(
+    'snakecase',
     """Return text in snake_case style.
 
     Args:
@@ -58,12 +164,11 @@ def snakecase(text, acronyms=None):
     'hello_world'
     >>> snakecase("HelloHTMLWorld", True, ["HTML"])
     'hello_html_world'
-    """
-    words, _case, _sep = case_parse.parse_case(text, acronyms)
-    return '_'.join([w.lower() for w in words])
+    """)
 
 
-def dashcase(text, acronyms=None):
+dashcase = _converter(
+    'dashcase',
     """Return text in dash-case style (aka kebab-case, spinal-case).
 
     Args:
@@ -75,44 +180,11 @@ def dashcase(text, acronyms=None):
     'hello-world'
     >>> dashcase("HelloHTMLWorld", True, ["HTML"])
     'hello-html-world'
-    """
-    words, _case, _sep = case_parse.parse_case(text, acronyms)
-    return '-'.join([w.lower() for w in words])
-
-
-def kebabcase(text, acronyms=None):
-    """Return text in kebab-case style (aka snake-case, spinal-case).
-
-    Args:
-        text: input string to convert case
-        detect_acronyms: should attempt to detect acronyms
-        acronyms: a list of acronyms to detect
-
-    >>> kebabcase("hello world")
-    'hello-world'
-    >>> kebabcase("HelloHTMLWorld", True, ["HTML"])
-    'hello-html-world'
-    """
-    return dashcase(text, acronyms)
-
+    """)
 
-def spinalcase(text, acronyms=None):
-    """Return text in spinal-case style (aka snake-case, kebab-case).
 
-    Args:
-        text: input string to convert case
-        detect_acronyms: should attempt to detect acronyms
-        acronyms: a list of acronyms to detect
-
-    >>> spinalcase("hello world")
-    'hello-world'
-    >>> spinalcase("HELLO_HTML_WORLD", True, ["HTML"])
-    'hello-html-world'
-    """
-    return dashcase(text, acronyms)
-
-
-def constcase(text, acronyms=None):
+constcase = _converter(
+    'constcase',
     """Return text in CONST_CASE style (aka SCREAMING_SNAKE_CASE).
 
     Args:
@@ -124,28 +196,11 @@ def constcase(text, acronyms=None):
     'HELLO_WORLD'
     >>> constcase("helloHTMLWorld", True, ["HTML"])
     'HELLO_HTML_WORLD'
-    """
-    words, _case, _sep = case_parse.parse_case(text, acronyms)
-    return '_'.join([w.upper() for w in words])
+    """)
 
 
-def screaming_snakecase(text, acronyms=None):
-    """Return text in SCREAMING_SNAKE_CASE style (aka CONST_CASE).
-
-    Args:
-        text: input string to convert case
-        detect_acronyms: should attempt to detect acronyms
-        acronyms: a list of acronyms to detect
-
-    >>> screaming_snakecase("hello world")
-    'HELLO_WORLD'
-    >>> screaming_snakecase("helloHTMLWorld", True, ["HTML"])
-    'HELLO_HTML_WORLD'
-    """
-    return constcase(text, acronyms)
-
-
-def dotcase(text, acronyms=None):
+dotcase = _converter(
+    'dotcase',
     """Return text in dot.case style.
 
     Args:
@@ -157,12 +212,11 @@ def dotcase(text, acronyms=None):
     'hello.world'
     >>> dotcase("helloHTMLWorld", True, ["HTML"])
     'hello.html.world'
-    """
-    words, _case, _sep = case_parse.parse_case(text, acronyms)
-    return '.'.join([w.lower() for w in words])
+    """)
 
 
-def separate_words(text, acronyms=None):
+separate_words = _converter(
+    'separate_words',
     """Return text in "seperate words" style.
 
     Args:
@@ -174,12 +228,11 @@ def separate_words(text, acronyms=None):
     'HELLO WORLD'
     >>> separate_words("helloHTMLWorld", True, ["HTML"])
     'hello HTML World'
-    """
-    words, _case, _sep = case_parse.parse_case(text, acronyms, preserve_case=True)
-    return ' '.join(words)
+    """)
 
 
-def slashcase(text, acronyms=None):
+slashcase = _converter(
+    'slashcase',
     """Return text in slash/case style.
 
     Args:
@@ -191,12 +244,11 @@ def slashcase(text, acronyms=None):
     'HELLO/WORLD'
     >>> slashcase("helloHTMLWorld", True, ["HTML"])
     'hello/HTML/World'
-    """
-    words, _case, _sep = case_parse.parse_case(text, acronyms, preserve_case=True)
-    return '/'.join(words)
+    """)
 
 
-def backslashcase(text, acronyms=None):
+backslashcase = _converter(
+    'backslashcase',
     """Return text in backslash\case style.
 
     Args:
@@ -208,6 +260,260 @@ def backslashcase(text, acronyms=None):
     True
     >>> backslashcase("helloHTMLWorld", True, ["HTML"]) == r'hello\HTML\World'
     True
+    """)
+
+
+kebabcase = spinalcase = dashcase
+screaming_snakecase = constcase
+
+_CONVERTERS.update((name, _CONVERTERS[styles.get(name).name])
+                   for name in styles.names())
+
+
+def _convert_binary(converter, data, acronyms):
+    """Run converter on ASCII binary data, returning bytes."""
+    return converter(case_parse._ascii_text(data), acronyms).encode('ascii')
+
+
+def convert(text, style, acronyms=None):
+    """Return text converted to the given style.
+
+    Args:
+        text: input string to convert case
+        style: style name, e.g. "snake" or "snakecase", or the name of a
+               style added with register_style()
+        acronyms: a list of acronyms to detect
+
+    >>> convert("helloHTMLWorld", "snake", ["HTML"])
+    'hello_html_world'
+    """
+    converter = _CONVERTERS.get(style)
+    if converter is None:
+        # Raises ValueError for the unknown style.
+        styles.get(style)
+    return converter(text, acronyms)
+
+
+def register_style(name, separator='', word='keep', first_word=None,
+                   preserve_case=False, aliases=()):
+    """Add a custom style, usable wherever a style name is.
+
+    The style is declared by how it joins and cases the parsed words. Words
+    are PascalCase (with known acronyms upper-case) unless preserve_case is
+    set, in which case they keep the case they had in the input.
+
+    Args:
+        name: name of the new style
+        separator: string put between words
+        word: rule casing each word: "keep", "lower", "upper" or
+              "capitalize"
+        first_word: rule casing the first word (default: same as word)
+        preserve_case: whether to keep the original case of words
+        aliases: other names for the style
+
+    Returns:
+        The style's converter function, taking text and acronyms.
+
+    >>> train = register_style("train", "-", aliases=["Train-Case"])
+    >>> train("helloHTMLWorld", ["HTML"])
+    'Hello-HTML-World'
+    """
+    style = styles.Style(name, separator, word,
+                         word if first_word is None else first_word,
+                         preserve_case)
+    styles.register(style, aliases)
+    converter = _CONVERTERS.get(name)
+    if converter is None:
+        converter = _make_converter(
+            style, 'Return text in {} style.'.format(name))
+        canonical = _canonical(style)
+        if canonical is not None:
+            _CANONICAL[name] = canonical
+    for alias in (name,) + tuple(aliases):
+        _CONVERTERS[alias] = converter
+    return converter
+
+
+def _resolve_style(style):
+    """Return the registered Style for a style name or alias."""
+    return styles.get(style)
+
+
+def is_case(text, style, acronyms=None):
+    """Return whether text is already in the given style.
+
+    That is, whether converting text to style would return it unchanged.
+    ASCII text in another style is usually rejected at the first character
+    that doesn't fit, without parsing it.
+
+    Args:
+        text: input string to check
+        style: style name, e.g. "snake" or "snakecase"
+        acronyms: a list of acronyms to detect
+
+    >>> is_case("hello_world", "snake")
+    True
+    >>> is_case("helloWorld", "snake")
+    False
     """
-    words, _case, _sep = case_parse.parse_case(text, acronyms, preserve_case=True)
-    return '\\'.join(words)
+    style = _resolve_style(style)
+    if not text:
+        return True
+    if isinstance(text, _BINARY):
+        text = case_parse._ascii_text(text)
+    canonical = _CANONICAL.get(style.name)
+    if canonical is not None and case_parse._isascii(text):
+        pattern, check, with_acronyms = canonical
+        if not pattern.match(text):
+            return False
+        if check is not None and (with_acronyms or not acronyms) and \
+                check(text):
+            return True
+    return _CONVERTERS[style.name](text, acronyms) == text
+
+
+def compile_converter(style, acronyms=None, binary=False):
+    """Return a converter function specialized for one style and acronyms.
+
+    The acronyms are sanitized and compiled once, and the returned function
+    only runs the steps its style needs: no case type detection, and either
+    normalization or case preservation, never both. It bypasses the
+    parse_case cache and statistics.
+
+    The function takes text, or with binary, ASCII bytes, bytearray or
+    memoryview input, which it converts into bytes. The input type is
+    fixed when the function is built, so it doesn't check it on every call.
+
+    Args:
+        style: style name, e.g. "snake" or "snakecase"
+        acronyms: a list of acronyms to detect
+        binary: whether the function converts binary input instead of text
+
+    >>> to_snake = compile_converter("snake", acronyms=["HTML"])
+    >>> to_snake("HelloHTMLWorld")
+    'hello_html_world'
+    """
+    style = _resolve_style(style)
+    render = styles.renderer(style)
+    matcher = case_parse.AcronymMatcher(acronyms) if acronyms else None
+    canonical = _CANONICAL.get(style.name)
+    check, with_acronyms = canonical[1:] if canonical else (None, False)
+    if matcher and not with_acronyms:
+        check = None
+
+    isascii = case_parse._isascii
+    split = case_parse._split_words
+    group = case_parse._group_letter_runs
+    normalize = case_parse._normalize_words_untimed
+    known = matcher or ()
+
+    if style.preserve_case:
+        def convert(text):
+            words, was_upper = split(text)
+            words = group(words, text, matcher)
+            if was_upper:
+                words = [w.upper() for w in words]
+            return render(words)
+    else:
+        def convert(text):
+            if check is not None and isascii(text) and check(text):
+                return text
+            words, _was_upper = split(text)
+            return render(normalize(group(words, text, matcher), known))
+
+    if binary:
+        convert_text = convert
+        ascii_text = case_parse._ascii_text
+
+        def convert(data):
+            return convert_text(ascii_text(data)).encode('ascii')
+
+    convert.__name__ = style.name
+    convert.__doc__ = _CONVERTERS[style.name].__doc__.strip().split('\n')[0]
+    return convert
+
+
+def _converter_method(converter):
+    """Wrap a module-level converter as a CaseConverter method."""
+    def method(self, text):
+        return self._convert(converter, text)
+    method.__name__ = converter.__name__
+    method.__doc__ = converter.__doc__.strip().split('\n')[0]
+    return method
+
+
+class CaseConverter(object):
+    """Case converter with a fixed, pre-sanitized set of acronyms.
+
+    Acronyms are validated and compiled once, when the converter is built,
+    instead of on every call. The cache_size most recently converted strings
+    are memoized per converter.
+
+    Args:
+        acronyms: a list of acronyms to detect
+        cache_size: maximum number of memoized conversions (0 disables)
+
+    >>> converter = CaseConverter(acronyms=["HTML"])
+    >>> converter.snakecase("HelloHTMLWorld")
+    'hello_html_world'
+    """
+
+    def __init__(self, acronyms=None, cache_size=1024):
+        if acronyms:
+            self._acronyms = case_parse.AcronymMatcher(acronyms)
+        else:
+            self._acronyms = None
+        self._cache = (ShardedLRUCache(cache_size) if cache_size > 0
+                       else None)
+
+    @property
+    def acronyms(self):
+        """Tuple of the sanitized acronyms used by this converter."""
+        return self._acronyms.acronyms if self._acronyms else ()
+
+    def cache_info(self):
+        """Return conversion cache statistics, or None if it is disabled."""
+        if self._cache is None:
+            return None
+        return self._cache.info()
+
+    def cache_clear(self):
+        """Clear the conversion cache and its statistics."""
+        if self._cache is not None:
+            self._cache.clear()
+
+    def converter(self, style):
+        """Return a function converting text to style with this converter.
+
+        Works for every style name, including those added with
+        register_style().
+        """
+        return functools.partial(self._convert,
+                                 _CONVERTERS[_resolve_style(style).name])
+
+    def convert(self, text, style):
+        """Return text converted to the given style."""
+        return self._convert(_CONVERTERS[_resolve_style(style).name], text)
+
+    def _convert(self, converter, text):
+        if isinstance(text, _BINARY):
+            return self._convert(converter,
+                                 case_parse._ascii_text(text)).encode('ascii')
+        if self._cache is None:
+            return converter(text, self._acronyms)
+        key = (converter, text)
+        result = self._cache.get(key)
+        if result is None:
+            result = converter(text, self._acronyms)
+            self._cache.put(key, result)
+        return result
+
+    camelcase = _converter_method(camelcase)
+    pascalcase = _converter_method(pascalcase)
+    snakecase = _converter_method(snakecase)
+    dashcase = kebabcase = spinalcase = _converter_method(dashcase)
+    constcase = screaming_snakecase = _converter_method(constcase)
+    dotcase = _converter_method(dotcase)
+    separate_words = _converter_method(separate_words)
+    slashcase = _converter_method(slashcase)
+    backslashcase = _converter_method(backslashcase)
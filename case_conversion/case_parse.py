@@ -1,16 +1,93 @@
+from array import array
+from timeit import default_timer as _timer
+import codecs
+import re
 import regex
 import sys
+import threading
 
 PYTHON2 = sys.version_info[0] < 3
 if not PYTHON2:
     xrange = range
     unicode = str
+    unichr = chr
+    from . import styles
+    from .cache import ShardedLRUCache
+else:
+    import styles
+    from cache import ShardedLRUCache
+
+# Binary input types, parsed as ASCII text (bytes is str on Python 2).
+BINARY_TYPES = (bytearray, memoryview) if PYTHON2 else (bytes, bytearray,
+                                                         memoryview)
 
 
 UPPER = regex.compile(u'^[\p{Lu}]$')
 SEP = regex.compile(u'^[^\p{Ll}\p{Lu}\p{Nd}]$')
 NOTSEP = regex.compile(u'^[\p{Ll}\p{Lu}\p{Nd}]$')
 
+# Single-pass tokenizer: every match is either a word (group 1) or a run of
+# separator characters (group 2). A word starts at an upper-case letter or at
+# the first non-separator after a separator.
+TOKEN = regex.compile(u'([\\p{Lu}][\\p{Ll}\\p{Nd}]*|[\\p{Ll}\\p{Nd}]+)|'
+                      u'([^\\p{Ll}\\p{Lu}\\p{Nd}]+)')
+
+# ASCII equivalents of the patterns above, for the ASCII fast path. Within
+# ASCII, \p{Lu}, \p{Ll} and \p{Nd} are exactly A-Z, a-z and 0-9.
+ASCII_TOKEN = re.compile(r'([A-Z][a-z0-9]*|[a-z0-9]+)|([^A-Za-z0-9]+)')
+ASCII_UPPER = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+
+# A single separator character, to find a string's first separator.
+SEPARATOR = regex.compile(u'[^\\p{Ll}\\p{Lu}\\p{Nd}]')
+ASCII_SEPARATOR = re.compile(r'[^A-Za-z0-9]')
+
+# Runs of non-separator characters.
+WORD_RUN = regex.compile(u'[\\p{Ll}\\p{Lu}\\p{Nd}]+')
+
+try:
+    _isascii = str.isascii
+except AttributeError:
+    # Python < 3.7
+    def _isascii(string):
+        try:
+            string.encode('ascii')
+        except UnicodeError:
+            return False
+        return True
+
+
+def _ascii_text(data):
+    """
+    Return binary data (bytes, bytearray or memoryview) decoded as ASCII.
+
+    Raises UnicodeDecodeError on non-ASCII data.
+    """
+    if isinstance(data, bytes):
+        return data.decode('ascii')
+    # Decodes straight from the buffer, without copying it to bytes first.
+    return codecs.ascii_decode(data)[0]
+
+# Set to True to segment strings with the original character-by-character
+# loop instead of the single-pass tokenizer (useful for comparing the two).
+USE_LEGACY_TOKENIZER = False
+
+# Character classes, as stored in the codepoint table (see _char_table()).
+# The classes mirror the patterns above: SEP matches CLASS_SEP, NOTSEP
+# matches CLASS_NOTSEP and CLASS_UPPER, and UPPER matches CLASS_UPPER.
+CLASS_SEP = 0
+CLASS_NOTSEP = 1
+CLASS_UPPER = 2
+
+_BMP_SIZE = 0x10000
+_CLASS_RUNS = ((CLASS_NOTSEP, regex.compile(u'[\\p{Ll}\\p{Nd}]+')),
+               (CLASS_UPPER, regex.compile(u'[\\p{Lu}]+')))
+_char_classes = None
+
+VALID_ACRONYM = regex.compile(u'^[\p{Ll}\p{Lu}\p{Nd}]+$')
+
+# Marks the end of an acronym in an AcronymMatcher trie node.
+_END = None
+
 
 def _determine_case(was_upper, words, string):
     """
@@ -38,12 +115,18 @@ def _determine_case(was_upper, words, string):
         case_type = 'upper'
     elif string.islower():
         case_type = 'lower'
-    elif len(words) > 0:
-        camel_case = words[0].islower()
-        pascal_case = words[0].istitle() or words[0].isupper()
+    else:
+        # Only look at as many words as needed; words may be a generator.
+        words = iter(words)
+        first = next(words, None)
+        if first is None:
+            return case_type
+
+        camel_case = first.islower()
+        pascal_case = first.istitle() or first.isupper()
 
         if camel_case or pascal_case:
-            for word in words[1:]:
+            for word in words:
                 c = word.istitle() or word.isupper()
                 camel_case &= c
                 pascal_case &= c
@@ -60,82 +143,19 @@ def _determine_case(was_upper, words, string):
     return case_type
 
 
-def _advanced_acronym_detection(s, i, words, acronyms):
+def _advanced_acronym_detection(acstr, acronyms):
     """
     Detect acronyms by checking against a list of acronyms.
 
-    Check a run of words represented by the range [s, i].
-    Return last index of new word groups.
-    """
-    # Combine each letter into single string.
-    acstr = ''.join(words[s:i])
-
-    # List of ranges representing found acronyms.
-    range_list = []
-    # Set of remaining letters.
-    not_range = set(range(len(acstr)))
-
-    # Search for each acronym in acstr.
-    for acronym in acronyms:
-        # TODO: Sanitize acronyms to include only letters.
-        rac = regex.compile(unicode(acronym))
-
-        # Loop until all instances of the acronym are found,
-        # instead of just the first.
-        n = 0
-        while True:
-            m = rac.search(acstr, n)
-            if not m:
-                break
-
-            a, b = m.start(), m.end()
-            n = b
-
-            # Make sure found acronym doesn't overlap with others.
-            ok = True
-            for r in range_list:
-                if a < r[1] and b > r[0]:
-                    ok = False
-                    break
-
-            if ok:
-                range_list.append((a, b))
-                for j in xrange(a, b):
-                    not_range.remove(j)
-
-    # Add remaining letters as ranges.
-    for nr in not_range:
-        range_list.append((nr, nr + 1))
-
-    # No ranges will overlap, so it's safe to sort by lower bound,
-    # which sort() will do by default.
-    range_list.sort()
-
-    # Remove original letters in word list.
-    for _ in xrange(s, i):
-        del words[s]
-
-    # Replace them with new word grouping.
-    for j in xrange(len(range_list)):
-        r = range_list[j]
-        words.insert(s + j, acstr[r[0]:r[1]])
-
-    return s + len(range_list) - 1
+    Split a run of upper-case letters into found acronyms and remaining
+    single letters. Return the new word grouping.
+    """
+    return [acstr[a:b] for a, b in acronyms.find(acstr)]
 
 
-def _simple_acronym_detection(s, i, words, *args):
+def _simple_acronym_detection(acstr, *args):
     """Detect acronyms based on runs of upper-case letters."""
-    # Combine each letter into a single string.
-    acronym = ''.join(words[s:i])
-
-    # Remove original letters in word list.
-    for _ in xrange(s, i):
-        del words[s]
-
-    # Replace them with new word grouping.
-    words.insert(s, ''.join(acronym))
-
-    return s
+    return [acstr]
 
 
 class InvalidAcronymError(Exception):
@@ -154,18 +174,176 @@ def _sanitize_acronyms(unsafe_acronyms):
     Normalize valid acronyms to upper-case.
     If an invalid acronym is encountered raise InvalidAcronymError.
     """
-    valid_acronym = regex.compile(u'^[\p{Ll}\p{Lu}\p{Nd}]+$')
     acronyms = []
     for a in unsafe_acronyms:
-        if valid_acronym.match(a):
+        if VALID_ACRONYM.match(a):
             acronyms.append(a.upper())
         else:
             raise InvalidAcronymError(a)
     return acronyms
 
 
+class AcronymMatcher(object):
+    """
+    Sanitized acronym list compiled into a trie for one-pass matching.
+
+    Build once and pass it anywhere a list of acronyms is accepted to skip
+    per-call sanitization. Earlier acronyms in the list take precedence over
+    later ones when their matches overlap.
+    """
+
+    def __init__(self, acronyms):
+        self.acronyms = tuple(_sanitize_acronyms(acronyms))
+        self._set = frozenset(self.acronyms)
+        self._trie = {}
+        for priority, acronym in enumerate(self.acronyms):
+            node = self._trie
+            for c in acronym:
+                node = node.setdefault(c, {})
+            # Keep the first listed priority for duplicate acronyms.
+            node.setdefault(_END, priority)
+
+    def __contains__(self, word):
+        return word in self._set
+
+    def __iter__(self):
+        return iter(self.acronyms)
+
+    def __len__(self):
+        return len(self.acronyms)
+
+    def __repr__(self):
+        return 'AcronymMatcher({!r})'.format(list(self.acronyms))
+
+    def find(self, acstr):
+        """
+        Split acstr into found acronyms and remaining single letters.
+
+        Returns a sorted list of non-overlapping (start, end) ranges covering
+        acstr.
+        """
+        # Collect every occurrence of every acronym with one trie walk per
+        # starting position, grouped by acronym priority.
+        length = len(acstr)
+        found = {}
+        for a in xrange(length):
+            node = self._trie
+            b = a
+            while b < length:
+                node = node.get(acstr[b])
+                if node is None:
+                    break
+                b += 1
+                if _END in node:
+                    found.setdefault(node[_END], []).append((a, b))
+
+        # Accept matches acronym by acronym in list order. Like repeated
+        # searches would, skip occurrences overlapping the previous one of
+        # the same acronym, and reject any overlapping an accepted match.
+        taken = bytearray(length)
+        accepted = {}
+        for priority in sorted(found):
+            n = 0
+            for a, b in found[priority]:
+                if a < n:
+                    continue
+                n = b
+                if not any(taken[a:b]):
+                    taken[a:b] = b'\x01' * (b - a)
+                    accepted[a] = b
+
+        # Walk acstr once, adding remaining letters as single ranges.
+        range_list = []
+        j = 0
+        while j < length:
+            b = accepted.get(j, j + 1)
+            range_list.append((j, b))
+            j = b
+        return range_list
+
+
+def _char_table():
+    """
+    Return the class of every Basic Multilingual Plane codepoint.
+
+    The table is a bytearray indexed by codepoint, built from the regex
+    classes on first use (a few milliseconds) and shared from then on.
+    """
+    global _char_classes
+    if _char_classes is None:
+        chars = u''.join([unichr(i) for i in xrange(_BMP_SIZE)])
+        table = bytearray(_BMP_SIZE)
+        for char_class, pattern in _CLASS_RUNS:
+            for match in pattern.finditer(chars):
+                start, end = match.span()
+                table[start:end] = bytearray([char_class]) * (end - start)
+        _char_classes = table
+    return _char_classes
+
+
+def _char_class(char):
+    """Return the class of a single character: CLASS_SEP, ... or UPPER."""
+    code = ord(char)
+    if code < _BMP_SIZE:
+        return _char_table()[code]
+    # Higher planes are rare in identifiers; match them one by one.
+    if UPPER.match(char):
+        return CLASS_UPPER
+    if NOTSEP.match(char):
+        return CLASS_NOTSEP
+    return CLASS_SEP
+
+
+def _is_upper_letter(word):
+    """Return whether word is a single upper-case letter."""
+    return len(word) == 1 and _char_class(word) == CLASS_UPPER
+
+
+# Matchers built by parse_case for plain acronym lists, keyed by tuple.
+# Matchers are immutable and single dict operations are atomic, so threads
+# share this without a lock; a race at worst builds the same matcher twice.
+_ACRONYM_MATCHERS = {}
+_ACRONYM_MATCHERS_SIZE = 64
+
+
+def _get_acronym_matcher(acronyms):
+    """Return an AcronymMatcher for acronyms, reusing previously built ones."""
+    if isinstance(acronyms, AcronymMatcher):
+        return acronyms
+    key = tuple(acronyms)
+    matcher = _ACRONYM_MATCHERS.get(key)
+    if matcher is None:
+        matcher = AcronymMatcher(key)
+        if len(_ACRONYM_MATCHERS) >= _ACRONYM_MATCHERS_SIZE:
+            _ACRONYM_MATCHERS.clear()
+        _ACRONYM_MATCHERS[key] = matcher
+    return matcher
+
+
+def _determine_case_timed(was_upper, words, string):
+    """_determine_case, timed in the parse statistics if enabled."""
+    stats = _stats
+    if stats is not None:
+        start = _timer()
+        case_type = _determine_case(was_upper, words, string)
+        stats.counters().time['case'] += _timer() - start
+        return case_type
+    return _determine_case(was_upper, words, string)
+
+
 def _normalize_words(words, acronyms):
     """Normalize case of each word to PascalCase."""
+    stats = _stats
+    if stats is not None:
+        start = _timer()
+        words = _normalize_words_untimed(words, acronyms)
+        stats.counters().time['normalize'] += _timer() - start
+        return words
+    return _normalize_words_untimed(words, acronyms)
+
+
+def _normalize_words_untimed(words, acronyms):
+    """Body of _normalize_words, without instrumentation."""
     for i, _ in enumerate(words):
         # if detect_acronyms:
         if words[i].upper() in acronyms:
@@ -182,6 +360,71 @@ def _separate_words(string):
     """
     Segment string on separator into list of words.
 
+    Arguments:
+        string -- the string we want to process
+
+    Returns:
+        words -- list of words the string got minced to
+        separator -- the separator char intersecting words
+        was_upper -- whether string happened to be upper-case
+    """
+    if USE_LEGACY_TOKENIZER:
+        return _separate_words_legacy(string)
+    words, was_upper = _split_words(string)
+    return words, _find_separator(string), was_upper
+
+
+def _split_words(string):
+    """
+    Segment string on separator into list of words, like _separate_words,
+    without looking for its separator.
+
+    Returns:
+        words -- list of words the string got minced to
+        was_upper -- whether string happened to be upper-case
+    """
+    if USE_LEGACY_TOKENIZER:
+        words, _separator, was_upper = _separate_words_legacy(string)
+        return words, was_upper
+
+    # Treat an all-caps string as lower-case, so that every letter isn't
+    # counted as a boundary.
+    was_upper = False
+    if string.isupper():
+        string = string.lower()
+        was_upper = True
+
+    # Pure ASCII strings skip the Unicode property classes of the regex
+    # module and use the equivalent plain re pattern.
+    token = ASCII_TOKEN if _isascii(string) else TOKEN
+
+    # Use None to indicate a separator in the word list.
+    return [word or None for word, _sep in token.findall(string)], was_upper
+
+
+def _find_separator(string):
+    """
+    Return the first separator character of string, or "" if it has none.
+
+    This is the separator parse_case reports, see _separate_words().
+    """
+    # Separators are looked for where _separate_words looks for them, in
+    # the lower-cased string if string is all caps.
+    if string.isupper():
+        string = string.lower()
+    separator = (ASCII_SEPARATOR if _isascii(string) else
+                 SEPARATOR).search(string)
+    if separator is None:
+        return ""
+    return separator.group()
+
+
+def _separate_words_legacy(string):
+    """
+    Segment string on separator into list of words, one char at a time.
+
+    Original implementation of _separate_words, kept for comparison.
+
     Arguments:
         string -- the string we want to process
 
@@ -252,7 +495,417 @@ def _separate_words(string):
     return words, separator, was_upper
 
 
-def parse_case(string, acronyms=None, preserve_case=False):
+def _render_property(style, doc):
+    """Return a property rendering a ParsedIdentifier in the given style."""
+    def render(self):
+        return self.render(style)
+    render.__doc__ = doc
+    return property(render)
+
+
+class ParsedIdentifier(object):
+    """
+    Words of a parsed string, renderable in every style.
+
+    The string is parsed once; each style is rendered on first access and
+    then cached, e.g. parsed.camel, parsed.snake or parsed.const, or
+    parsed.render(style) for any registered style.
+
+    Attributes:
+        case -- the case type, as returned by parse_case
+        separator -- the first separator character, or ""
+    """
+
+    __slots__ = ('_string', '_raw', '_was_upper', '_acronyms',
+                 '_preserve_case', '_case', '_separator', '_normalized',
+                 '_preserved', '_rendered')
+
+    def __init__(self, string, acronyms=None, preserve_case=False):
+        if acronyms:
+            acronyms = _get_acronym_matcher(acronyms)
+        words, self._was_upper = _parse_words(string, acronyms)
+        self._string = string
+        self._raw = tuple(words)
+        self._acronyms = acronyms
+        self._preserve_case = preserve_case
+        self._case = None
+        self._separator = None
+        self._normalized = None
+        self._preserved = None
+        self._rendered = None
+
+    def __repr__(self):
+        return ('ParsedIdentifier(words={!r}, case={!r}, separator={!r})'
+                .format(self.words, self.case, self.separator))
+
+    @property
+    def case(self):
+        """The case type, as returned by parse_case."""
+        if self._case is None:
+            self._case = _determine_case_timed(self._was_upper, self._raw,
+                                               self._string)
+        return self._case
+
+    @property
+    def separator(self):
+        """The first separator character, or ""."""
+        if self._separator is None:
+            self._separator = _find_separator(self._string)
+        return self._separator
+
+    @property
+    def words(self):
+        """Tuple of words, as parse_case would return them."""
+        if self._preserve_case:
+            return self.preserved_words
+        return self.normalized_words
+
+    @property
+    def normalized_words(self):
+        """Tuple of words normalized to PascalCase (known acronyms upper)."""
+        if self._normalized is None:
+            self._normalized = tuple(
+                _normalize_words(list(self._raw), self._acronyms or []))
+        return self._normalized
+
+    @property
+    def preserved_words(self):
+        """Tuple of words with their original case."""
+        if self._preserved is None:
+            if self._was_upper:
+                self._preserved = tuple([w.upper() for w in self._raw])
+            else:
+                self._preserved = self._raw
+        return self._preserved
+
+    def render(self, style):
+        """Return the words in the given style, by name or alias."""
+        style = styles.get(style)
+        rendered = self._rendered
+        if rendered is None:
+            rendered = self._rendered = {}
+        try:
+            return rendered[style]
+        except KeyError:
+            pass
+        if style.preserve_case:
+            words = self.preserved_words
+        else:
+            words = self.normalized_words
+        text = rendered[style] = styles.renderer(style)(words)
+        return text
+
+    camel = _render_property('camel', 'Words in camelCase style.')
+    pascal = _render_property('pascal', 'Words in PascalCase style.')
+    snake = _render_property('snake', 'Words in snake_case style.')
+    dash = kebab = spinal = _render_property('dash',
+                                             'Words in dash-case style.')
+    const = screaming_snake = _render_property('const',
+                                               'Words in CONST_CASE style.')
+    dot = _render_property('dot', 'Words in dot.case style.')
+    separate_words = _render_property('separate_words',
+                                      'Words in "separate words" style.')
+    slash = _render_property('slash', 'Words in slash/case style.')
+    backslash = _render_property('backslash',
+                                 'Words in backslash\\case style.')
+
+
+def detect_case(string, acronyms=None):
+    """
+    Return the case type of string, as parse_case would.
+
+    Like parse_case, accepts ASCII bytes, bytearray or memoryview input.
+
+    ASCII strings are scanned word by word without building a word list,
+    stopping as soon as the case type is settled. Other strings are parsed
+    in full, since how runs of capitals are grouped can matter for them.
+    """
+    if isinstance(string, BINARY_TYPES):
+        string = _ascii_text(string)
+    if string.isupper():
+        return 'upper'
+    if not _isascii(string):
+        if acronyms:
+            acronyms = _get_acronym_matcher(acronyms)
+        words, was_upper = _parse_words(string, acronyms)
+        return _determine_case(was_upper, words, string)
+    # A single capital is upper-case whether or not it's grouped with its
+    # neighbours into an acronym, so the ungrouped words give the same case.
+    words = (m.group(1) for m in ASCII_TOKEN.finditer(string)
+             if m.lastindex == 1)
+    return _determine_case(False, words, string)
+
+
+def parse_spans(string, acronyms=None):
+    """
+    Parse a string into word boundaries instead of a list of words.
+
+    Words are the same as the ones parse_case finds, but no substrings are
+    created for them. The one exception is an all-caps string whose
+    lower-case form has a different length (e.g. one with u'\u0130', dotted
+    capital I): its offsets can't be mapped onto the lower-cased string
+    parse_case segments, so it is split on separators only.
+
+    Returns:
+        spans -- array('I') of word offsets into string, as consecutive
+                 start and end pairs: [start0, end0, start1, end1, ...]
+        case_type -- the case type, as returned by parse_case
+    """
+    if acronyms:
+        acronyms = _get_acronym_matcher(acronyms)
+    is_ascii = _isascii(string)
+
+    # parse_case segments an all-caps string after lower-casing it. Capitals
+    # without a lower-case form (e.g. u'\U0001d400') are still split and
+    # grouped then, so the lower-cased string is scanned the same way.
+    was_upper = string.isupper()
+    lowered = string.lower() if was_upper else string
+    group_runs = len(lowered) == len(string)
+    if group_runs:
+        string = lowered
+        token = ASCII_TOKEN if is_ascii else TOKEN
+        matches = (m for m in token.finditer(string) if m.lastindex == 1)
+    else:
+        # Offsets into the lower-cased string wouldn't match string.
+        matches = WORD_RUN.finditer(string)
+    is_upper_letter = (ASCII_UPPER.__contains__ if is_ascii
+                       else _is_upper_letter)
+
+    spans = array('I')
+    # Range of the current run of adjacent single capitals.
+    run_start = run_end = None
+    for m in matches:
+        start, end = m.span()
+        if (group_runs and end - start == 1 and
+                is_upper_letter(string[start])):
+            if run_end == start:
+                run_end = end
+                continue
+            if run_start is not None:
+                _append_run_spans(spans, string, run_start, run_end, acronyms)
+            run_start, run_end = start, end
+            continue
+        if run_start is not None:
+            _append_run_spans(spans, string, run_start, run_end, acronyms)
+            run_start = run_end = None
+        spans.append(start)
+        spans.append(end)
+    if run_start is not None:
+        _append_run_spans(spans, string, run_start, run_end, acronyms)
+
+    words = (string[spans[k]:spans[k + 1]] for k in xrange(0, len(spans), 2))
+    return spans, _determine_case(was_upper, words, string)
+
+
+def _append_run_spans(spans, string, start, end, acronyms):
+    """Append the acronym grouping of the capitals in [start, end)."""
+    if not acronyms:
+        spans.append(start)
+        spans.append(end)
+        return
+    for a, b in acronyms.find(string[start:end]):
+        spans.append(start + a)
+        spans.append(start + b)
+
+
+# Optional LRU cache in front of parse_case, see set_cache_size(). Sharded,
+# so threads parsing different strings rarely contend for the same lock.
+_parse_cache = None
+
+
+def set_cache_size(maxsize):
+    """
+    Enable the parse_case cache with room for maxsize results.
+
+    Passing 0 or None disables the cache and drops its contents. Raises
+    ValueError if maxsize is negative.
+    """
+    global _parse_cache
+    if maxsize:
+        _parse_cache = ShardedLRUCache(maxsize)
+    else:
+        _parse_cache = None
+
+
+def cache_info():
+    """Return parse_case cache statistics, or None if it is disabled."""
+    cache = _parse_cache
+    if cache is None:
+        return None
+    return cache.info()
+
+
+def cache_clear():
+    """Clear the parse_case cache and its statistics."""
+    cache = _parse_cache
+    if cache is not None:
+        cache.clear()
+
+
+# Parse statistics and hooks, see enable_stats(). None while disabled, so
+# the uninstrumented path only pays for one global lookup per stage.
+_stats = None
+_parse_hooks = []
+
+_STAGES = ('separate', 'group', 'case', 'normalize')
+
+
+class _Counters(object):
+    """Parse statistics of a single thread."""
+
+    __slots__ = ('calls', 'time', 'lengths', 'acronym_matches')
+
+    def __init__(self):
+        self.calls = 0
+        self.time = dict.fromkeys(('total',) + _STAGES, 0.0)
+        self.lengths = {}
+        self.acronym_matches = 0
+
+
+class _ParseStats(object):
+    """
+    Counters collected by the instrumented parse_case.
+
+    Every thread updates its own _Counters, so instrumented threads neither
+    contend for nor lose updates to shared counters; snapshot() sums them.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = []
+
+    def counters(self):
+        """Return the _Counters of the calling thread."""
+        try:
+            return self._local.counters
+        except AttributeError:
+            counters = self._local.counters = _Counters()
+            with self._lock:
+                self._counters.append(counters)
+            return counters
+
+    def parse_case(self, string, acronyms, preserve_case, as_object):
+        counters = self.counters()
+        counters.calls += 1
+        # Bucket lengths by the next power of two: 0, 1, 2, 4, 8, ...
+        bucket = 1 << (len(string) - 1).bit_length() if string else 0
+        counters.lengths[bucket] = counters.lengths.get(bucket, 0) + 1
+
+        start = _timer()
+        result = _parse_case_cached(string, acronyms, preserve_case,
+                                    as_object)
+        elapsed = _timer() - start
+        counters.time['total'] += elapsed
+        for hook in list(_parse_hooks):
+            hook(string, result, elapsed)
+        return result
+
+    def parse_words(self, string, acronyms):
+        counters = self.counters()
+        time = counters.time
+        start = _timer()
+        words, was_upper = _split_words(string)
+        split = _timer()
+        words = _group_letter_runs(words, string, acronyms)
+        time['separate'] += split - start
+        time['group'] += _timer() - split
+        if acronyms:
+            counters.acronym_matches += sum(1 for w in words
+                                            if w.upper() in acronyms)
+        return words, was_upper
+
+    def snapshot(self):
+        with self._lock:
+            all_counters = list(self._counters)
+        time = dict.fromkeys(('total',) + _STAGES, 0.0)
+        lengths = {}
+        for counters in all_counters:
+            for stage, seconds in list(counters.time.items()):
+                time[stage] += seconds
+            for bucket, count in list(counters.lengths.items()):
+                lengths[bucket] = lengths.get(bucket, 0) + count
+
+        cache = cache_info()
+        if cache is not None:
+            lookups = cache.hits + cache.misses
+            cache = {
+                'hits': cache.hits,
+                'misses': cache.misses,
+                'hit_ratio': float(cache.hits) / lookups if lookups else 0.0,
+            }
+        return {
+            'calls': sum(counters.calls for counters in all_counters),
+            'time': time,
+            'lengths': lengths,
+            'acronym_matches': sum(counters.acronym_matches
+                                   for counters in all_counters),
+            'cache': cache,
+        }
+
+
+def enable_stats():
+    """
+    Start collecting parse_case statistics and calling parse hooks.
+
+    Statistics collected so far are kept; see reset_stats().
+    """
+    global _stats
+    if _stats is None:
+        _stats = _ParseStats()
+
+
+def disable_stats():
+    """Stop collecting statistics and calling hooks, dropping the counts."""
+    global _stats
+    _stats = None
+
+
+def reset_stats():
+    """Zero the statistics collected so far."""
+    global _stats
+    if _stats is not None:
+        _stats = _ParseStats()
+
+
+def stats():
+    """
+    Return a snapshot of parse_case statistics, or None if disabled.
+
+    The snapshot is a dict with:
+        calls -- number of parse_case calls
+        time -- cumulative seconds in parse_case ('total') and in each
+                stage: 'separate' (tokenizing), 'group' (grouping runs of
+                capitals), 'case' (case detection, timed when first read
+                for a ParsedIdentifier) and 'normalize'
+        lengths -- number of inputs by length, bucketed by the next power
+                   of two ({0: empty, 1: 1, 2: 2, 4: 3-4, 8: 5-8, ...})
+        acronym_matches -- number of known acronyms found in inputs
+        cache -- parse cache hits, misses and hit_ratio, or None if the
+                 cache is disabled
+    """
+    stats = _stats
+    if stats is None:
+        return None
+    return stats.snapshot()
+
+
+def add_parse_hook(hook):
+    """
+    Call hook(string, result, seconds) after each completed parse_case.
+
+    Hooks only run while statistics are enabled with enable_stats(). They
+    are called in the thread that parsed the string.
+    """
+    _parse_hooks.append(hook)
+
+
+def remove_parse_hook(hook):
+    """Remove a hook registered with add_parse_hook()."""
+    _parse_hooks.remove(hook)
+
+
+def parse_case(string, acronyms=None, preserve_case=False, as_object=False):
     """
     Parse a stringiable into a list of words.
 
@@ -269,51 +922,170 @@ def parse_case(string, acronyms=None, preserve_case=False):
 
     Also returns the first separator character, or False if there isn't one.
 
+    With as_object, returns a ParsedIdentifier instead, which can render the
+    words in any style without parsing string again. It only works out the
+    case type and separator when they are read.
+
+    ASCII bytes, bytearray or memoryview input is parsed like the decoded
+    text, and the words and separator are returned as bytes (a
+    ParsedIdentifier holds text).
+
+    Results are memoized when the cache is enabled with set_cache_size().
     """
-    words, separator, was_upper = _separate_words(string)
+    if isinstance(string, BINARY_TYPES):
+        return _parse_binary(string, acronyms, preserve_case, as_object)
+    stats = _stats
+    if stats is not None:
+        return stats.parse_case(string, acronyms, preserve_case, as_object)
+    return _parse_case_cached(string, acronyms, preserve_case, as_object)
 
-    if acronyms:
-        # Use advanced acronym detection with list
-        acronyms = _sanitize_acronyms(acronyms)
-        check_acronym = _advanced_acronym_detection
-    else:
-        acronyms = []
-        # Fallback to simple acronym detection.
-        check_acronym = _simple_acronym_detection
 
-    # Letter-run detector
+def _parse_binary(data, acronyms, preserve_case, as_object):
+    """parse_case for binary data, returning words as bytes."""
+    result = parse_case(_ascii_text(data), acronyms, preserve_case, as_object)
+    if as_object:
+        return result
+    words, case_type, separator = result
+    return ([w.encode('ascii') for w in words], case_type,
+            separator.encode('ascii'))
+
 
-    # Index of current word.
-    i = 0
-    # Index of first letter in run.
-    s = None
+def _parse_case_words(string, acronyms=None, preserve_case=False):
+    """
+    Return the words of parse_case(string, acronyms, preserve_case).
 
-    # Find runs of single upper-case letters.
-    while i < len(words):
-        word = words[i]
-        if word is not None and UPPER.match(word):
-            if s is None:
-                s = i
-        elif s is not None:
-            i = check_acronym(s, i, words, acronyms) + 1
-            s = None
+    The same as parse_case(...)[0], for text, without determining the case
+    type and separator unless statistics are enabled (parse hooks get them).
+    """
+    if _stats is not None:
+        return parse_case(string, acronyms, preserve_case)[0]
+    if acronyms:
+        acronyms = _get_acronym_matcher(acronyms)
+    cache = _parse_cache
+    if cache is None:
+        return _parse_case(string, acronyms, preserve_case)
+    return list(_cached_result(cache, string, acronyms, preserve_case)[0])
 
-        i += 1
 
-    if s is not None:
-        check_acronym(s, i, words, acronyms)
+def _parse_case_cached(string, acronyms, preserve_case, as_object):
+    """Body of parse_case, without instrumentation."""
+    if acronyms:
+        acronyms = _get_acronym_matcher(acronyms)
+    if as_object:
+        return _parse_identifier(string, acronyms, preserve_case)
+    cache = _parse_cache
+    if cache is None:
+        return _parse_result(string, acronyms, preserve_case)
+    words, case_type, separator = _cached_result(cache, string, acronyms,
+                                                 preserve_case)
+    return list(words), case_type, separator
+
+
+def _cached_result(cache, string, acronyms, preserve_case):
+    """Return the cached parse_case result, parsing string on a miss."""
+    key = (string, acronyms.acronyms if acronyms else None, preserve_case)
+    result = cache.get(key)
+    if result is None:
+        words, case_type, separator = _parse_result(string, acronyms,
+                                                    preserve_case)
+        # Store an immutable copy so callers can't corrupt cached words.
+        result = (tuple(words), case_type, separator)
+        cache.put(key, result)
+    return result
+
+
+def _parse_identifier(string, acronyms, preserve_case):
+    """Return a ParsedIdentifier for string, using the cache if enabled."""
+    cache = _parse_cache
+    if cache is None:
+        return ParsedIdentifier(string, acronyms, preserve_case)
+
+    # ParsedIdentifier is immutable, so it can be cached and shared as is.
+    key = (string, acronyms.acronyms if acronyms else None, preserve_case,
+           ParsedIdentifier)
+    parsed = cache.get(key)
+    if parsed is None:
+        parsed = ParsedIdentifier(string, acronyms, preserve_case)
+        cache.put(key, parsed)
+    return parsed
+
+
+def _parse_case(string, acronyms, preserve_case):
+    """
+    Uncached words of parse_case, taking acronyms as an AcronymMatcher or
+    None.
+    """
+    words, was_upper = _parse_words(string, acronyms)
+    return _case_words(words, was_upper, acronyms, preserve_case)
+
 
-    # Separators are no longer needed, so they can be removed. They *should*
-    # be removed, since it's supposed to be a *word* list.
-    words = [w for w in words if w is not None]
+def _parse_result(string, acronyms, preserve_case):
+    """Uncached parse_case, taking acronyms as an AcronymMatcher or None."""
+    words, was_upper = _parse_words(string, acronyms)
+    # The case type is determined from the words before normalization,
+    # which changes them in place.
+    case_type = _determine_case_timed(was_upper, words, string)
+    return (_case_words(words, was_upper, acronyms, preserve_case), case_type,
+            _find_separator(string))
 
-    # Determine case type.
-    case_type = _determine_case(was_upper, words, string)
 
+def _case_words(words, was_upper, acronyms, preserve_case):
+    """Normalize words, or restore their case if preserve_case."""
     if preserve_case:
         if was_upper:
             words = [w.upper() for w in words]
+        return words
+    return _normalize_words(words, acronyms or [])
+
+
+def _parse_words(string, acronyms):
+    """
+    Split string into words, grouping runs of capitals into acronyms.
+
+    Returns the words with their case untouched, and whether the string was
+    all upper-case.
+    """
+    stats = _stats
+    if stats is not None:
+        return stats.parse_words(string, acronyms)
+
+    words, was_upper = _split_words(string)
+    return _group_letter_runs(words, string, acronyms), was_upper
+
+
+def _group_letter_runs(words, string, acronyms):
+    """
+    Group runs of single upper-case letters in words into acronyms.
+
+    Separators (None) are dropped, leaving a plain word list.
+    """
+    if _isascii(string):
+        is_upper_letter = ASCII_UPPER.__contains__
+    else:
+        is_upper_letter = _is_upper_letter
+
+    if acronyms:
+        # Use advanced acronym detection with list
+        check_acronym = _advanced_acronym_detection
     else:
-        words = _normalize_words(words, acronyms)
+        # Fallback to simple acronym detection.
+        check_acronym = _simple_acronym_detection
 
-    return words, case_type, separator
+    # Letter-run detector. Build the grouped word list in one pass: runs of
+    # single upper-case letters are collected and replaced by their acronym
+    # grouping. Separators are no longer needed, so they are dropped. They
+    # *should* be dropped, since it's supposed to be a *word* list.
+    grouped = []
+    run = []
+    for word in words:
+        if word is not None and is_upper_letter(word):
+            run.append(word)
+            continue
+        if run:
+            grouped.extend(check_acronym(''.join(run), acronyms))
+            run = []
+        if word is not None:
+            grouped.append(word)
+    if run:
+        grouped.extend(check_acronym(''.join(run), acronyms))
+    return grouped
@@ -0,0 +1,210 @@
+import json
+import re
+import sys
+
+PYTHON = sys.version_info[0]
+
+if 3 == PYTHON:
+    # Python 3 and ST3
+    from .case_conversion import CaseConverter
+    string_types = (str, bytes)
+else:
+    # Python 2 and ST2
+    from case_conversion import CaseConverter
+    string_types = basestring  # noqa: F821
+
+# What the scanner stops at: a string, or a structural character; anything
+# in between (numbers, literals, whitespace, colons) is copied as is. A
+# string either ends at its closing quote (group 1) or runs to the end of
+# the text, possibly with a backslash whose escaped character is still to
+# come (group 2).
+TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*(?:(")|(\\)?\Z)|[{}\[\],]',
+                   re.DOTALL)
+# The rest of a string cut by a chunk boundary, up to (not including) its
+# closing quote. Stops early at a backslash that ends the text.
+STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+
+# Binary equivalents, for files opened in binary mode.
+BYTES_TOKEN = re.compile(TOKEN.pattern.encode('ascii'), re.DOTALL)
+BYTES_STRING_BODY = re.compile(STRING_BODY.pattern.encode('ascii'),
+                               re.DOTALL)
+
+# Structural characters by kind. Indexing text gives a character, indexing
+# bytes gives an int; both are listed so one table serves both.
+_QUOTE, _OPEN_OBJECT, _OPEN_ARRAY, _CLOSE, _COMMA = range(5)
+_KINDS = {}
+for _char, _kind in (('"', _QUOTE), ('{', _OPEN_OBJECT), ('[', _OPEN_ARRAY),
+                     ('}', _CLOSE), (']', _CLOSE), (',', _COMMA)):
+    _KINDS[_char] = _KINDS[ord(_char)] = _kind
+
+# Number of converted keys memoized before the memo is cleared, so
+# documents with unbounded distinct keys still run in bounded memory.
+_MEMO_SIZE = 1 << 16
+
+
+def convert_json_keys(source, style, acronyms=None, out=None,
+                      chunk_size=1 << 16):
+    """Convert every object key of a JSON document to the given style.
+
+    The document is scanned, not parsed: object keys are rewritten and
+    everything else, including string values, numbers and whitespace, is
+    copied byte for byte. File objects are read chunk_size characters (or
+    bytes) at a time, and only a key cut by a chunk boundary is held back,
+    so documents of any size are converted in constant memory (plus one
+    entry per level of nesting). Each distinct key is converted only once.
+
+    The source must be valid JSON; it isn't validated.
+
+    Args:
+        source: JSON text, bytes, bytearray or memoryview, or a file object
+                opened in text or binary mode (binary documents must be
+                UTF-8 and are converted to bytes)
+        style: style name, e.g. "snake" or "snakecase"
+        acronyms: a list of acronyms to detect
+        out: file object to write the converted document to, chunk by chunk
+        chunk_size: number of characters or bytes read from source at a time
+
+    Returns:
+        The converted document, or None if it was written to out.
+
+    >>> convert_json_keys('{"userId": 1, "tags": [{"tagName": "fooBar"}]}',
+    ...                   "snake")
+    '{"user_id": 1, "tags": [{"tag_name": "fooBar"}]}'
+    """
+    convert = CaseConverter(acronyms, 0).converter(style)
+    memo = {}
+
+    def convert_key(raw):
+        try:
+            return memo[raw]
+        except KeyError:
+            pass
+        text = raw if isinstance(raw, type(u'')) else raw.decode('utf-8')
+        # Keys without escapes are the common case; skip the JSON decoder.
+        key = json.loads(text) if u'\\' in text else text[1:-1]
+        converted = convert(key)
+        if converted == key:
+            result = raw
+        else:
+            result = json.dumps(converted, ensure_ascii=False)
+            if text is not raw:
+                result = result.encode('utf-8')
+        if len(memo) >= _MEMO_SIZE:
+            memo.clear()
+        memo[raw] = result
+        return result
+
+    if isinstance(source, string_types):
+        empty = source[:0]
+        chunks = [source]
+    elif isinstance(source, (bytearray, memoryview)):
+        empty = b''
+        chunks = _slice_chunks(memoryview(source), chunk_size)
+    else:
+        # An empty file gives an empty string of its type.
+        empty = None
+        chunks = _read_chunks(source, chunk_size)
+    chunks = _convert_chunks(chunks, convert_key)
+    if out is None:
+        chunks = list(chunks)
+        if not chunks:
+            return source.read(0) if empty is None else empty
+        return chunks[0][:0].join(chunks)
+    for chunk in chunks:
+        out.write(chunk)
+
+
+def _read_chunks(source, chunk_size):
+    """Yield chunks of up to chunk_size read from source until it ends."""
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _slice_chunks(view, chunk_size):
+    """Yield bytes copies of the chunk_size slices of a memoryview."""
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size].tobytes()
+
+
+def _convert_chunks(chunks, convert_key):
+    """Yield the JSON text of chunks with keys passed through convert_key."""
+    # Whether each open container is an object (True) or an array.
+    is_object = []
+    # Whether the next string is an object key.
+    expect_key = False
+    # Whether the previous chunk ended inside a string value.
+    in_string = False
+    carry = None
+    for chunk in chunks:
+        if carry:
+            text = carry + chunk
+        else:
+            text = chunk
+        carry = None
+        if isinstance(text, type(u'')):
+            token, string_body, backslash = TOKEN, STRING_BODY, u'\\'
+        else:
+            token, string_body, backslash = (BYTES_TOKEN, BYTES_STRING_BODY,
+                                             b'\\')
+
+        n = len(text)
+        # Converted text goes to out; text[pos:i] is still to be copied.
+        out = []
+        pos = i = 0
+        if in_string:
+            i = string_body.match(text).end()
+            if i == n or text[i:i + 1] == backslash:
+                # Still not closed. A backslash at the very end is kept
+                # with the character it escapes.
+                out.append(text[:i])
+                carry = text[i:]
+                yield text[:0].join(out)
+                continue
+            i += 1
+            in_string = False
+
+        while True:
+            match = token.search(text, i)
+            if match is None:
+                i = n
+                break
+            start, i = match.span()
+            kind = _KINDS[text[start]]
+            if kind == _QUOTE:
+                if match.group(1) is None:
+                    # The string goes on in the next chunk. Keys are held
+                    # back whole; values are copied up to the cut.
+                    if expect_key:
+                        i = start
+                    else:
+                        in_string = True
+                        if match.group(2) is not None:
+                            i -= 1
+                    carry = text[i:]
+                    break
+                if expect_key:
+                    out.append(text[pos:start])
+                    out.append(convert_key(match.group()))
+                    pos = i
+                    expect_key = False
+            elif kind == _OPEN_OBJECT:
+                is_object.append(True)
+                expect_key = True
+            elif kind == _OPEN_ARRAY:
+                is_object.append(False)
+                expect_key = False
+            elif kind == _COMMA:
+                expect_key = bool(is_object) and is_object[-1]
+            else:
+                if is_object:
+                    is_object.pop()
+                expect_key = False
+
+        out.append(text[pos:i])
+        yield text[:0].join(out)
+    if carry:
+        # A truncated document: pass the incomplete tail through.
+        yield carry
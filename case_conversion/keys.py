@@ -0,0 +1,96 @@
+import sys
+
+PYTHON = sys.version_info[0]
+
+if 3 == PYTHON:
+    # Python 3 and ST3
+    from .case_conversion import CaseConverter
+    string_types = str
+else:
+    # Python 2 and ST2
+    from case_conversion import CaseConverter
+    string_types = basestring  # noqa: F821
+
+
+def convert_keys(obj, style, acronyms=None, skip=None, cache=None):
+    """Return a copy of obj with every dict key converted to the given style.
+
+    Walks nested dicts, lists and tuples without recursion, so arbitrarily
+    deep payloads are fine. Only string keys are converted; values are kept
+    as is. Each distinct key is converted once per call, or once overall when
+    a shared cache is passed.
+
+    Args:
+        obj: dict, list or tuple to convert (other values are returned as is)
+        style: style name, e.g. "camel" or "camelcase"
+        acronyms: a list of acronyms to detect
+        skip: key paths whose values are kept as is, without converting
+              keys inside them; a path is a tuple of the original dict keys
+              leading to the value (list and tuple levels are not part of
+              it). Skipped values are shared with obj, not copied.
+        cache: dict mapping keys to converted keys, to share across calls
+               with the same style and acronyms
+
+    >>> convert_keys({"user_id": 1, "tags": [{"tag_name": "x"}]}, "camel")
+    {'userId': 1, 'tags': [{'tagName': 'x'}]}
+    >>> convert_keys({"raw_data": {"keep_me": 1}}, "camel",
+    ...              skip=[("raw_data",)])
+    {'rawData': {'keep_me': 1}}
+    """
+    convert = CaseConverter(acronyms, 0).converter(style)
+    memo = {} if cache is None else cache
+    skip = frozenset(tuple(path) for path in skip or ())
+
+    # Each frame walks one container: the iterator over its (key, value)
+    # pairs, its output, its key path, whether it is a dict or a tuple, and
+    # where its output sits in the parent output. Tuples are built as lists
+    # and swapped in once complete.
+    root = []
+    stack = [[iter(((None, obj),)), root, (), False, False, None, None]]
+    while stack:
+        frame = stack[-1]
+        items, out, path, is_dict = frame[:4]
+        for key, value in items:
+            if is_dict:
+                if isinstance(key, string_types):
+                    try:
+                        slot = memo[key]
+                    except KeyError:
+                        slot = memo[key] = convert(key)
+                else:
+                    slot = key
+                child_path = path + (key,) if skip else path
+            else:
+                slot = len(out)
+                child_path = path
+
+            if isinstance(value, dict) and child_path not in skip:
+                child = {}
+                child_items = iter(value.items())
+            elif isinstance(value, (list, tuple)) and child_path not in skip:
+                child = []
+                child_items = iter(enumerate(value))
+            else:
+                child = None
+
+            if child is None:
+                if is_dict:
+                    out[slot] = value
+                else:
+                    out.append(value)
+                continue
+
+            if is_dict:
+                out[slot] = child
+            else:
+                out.append(child)
+            stack.append([child_items, child, child_path,
+                          isinstance(value, dict), isinstance(value, tuple),
+                          out, slot])
+            break
+        else:
+            stack.pop()
+            if frame[4]:
+                frame[5][frame[6]] = tuple(out)
+
+    return root[0]
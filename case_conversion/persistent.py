@@ -0,0 +1,131 @@
+import hashlib
+import json
+import sqlite3
+import threading
+
+from . import __version__
+from .case_conversion import CaseConverter, _resolve_style
+from .styles import Style
+
+# Version of the file layout, part of the config hash so that files written
+# in an older layout are emptied rather than misread.
+_FORMAT = 2
+
+
+class PersistentCache(object):
+    """On-disk cache of conversions, stored in an SQLite file.
+
+    Up to cache_size stored conversions are read into memory on the first
+    lookup, and new conversions are written back in batches of flush_size
+    (and on flush() or close()). Memory use is bounded by cache_size: the
+    in-memory map is cleared when it fills up, while the file keeps every
+    conversion. The cache belongs to one acronym list and library version:
+    opening it with different ones empties it. Conversions are stored under
+    the full style declaration, so a style registered again under the same
+    name with other rules doesn't get the old results.
+
+    A cache can be shared between threads: lookups of stored conversions
+    take no lock, and new conversions are recorded under one.
+
+    Args:
+        path: path of the SQLite file, created if missing
+        acronyms: a list of acronyms to detect
+        flush_size: number of new conversions written at a time
+        cache_size: maximum number of conversions held in memory
+
+    >>> with PersistentCache("conversions.db", acronyms=["HTTP"]) as cache:
+    ...     cache.convert("HTTPError", "snake")
+    'http_error'
+    """
+
+    def __init__(self, path, acronyms=None, flush_size=1000,
+                 cache_size=1 << 16):
+        self.path = path
+        self.flush_size = flush_size
+        self.cache_size = cache_size
+        self._converter = CaseConverter(acronyms, 0)
+        self.config = hashlib.sha1(json.dumps(
+            [_FORMAT, __version__, list(self._converter.acronyms)]).encode('utf-8')
+        ).hexdigest()
+        self._db = None
+        self._results = None
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _load(self):
+        """Open the file, invalidate it if stale and read its entries."""
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute('CREATE TABLE IF NOT EXISTS meta '
+                   '(key TEXT PRIMARY KEY, value TEXT)')
+        db.execute('CREATE TABLE IF NOT EXISTS conversions '
+                   '(style TEXT, text TEXT, result TEXT, '
+                   'PRIMARY KEY (style, text))')
+        row = db.execute("SELECT value FROM meta WHERE key = 'config'"
+                         ).fetchone()
+        if row is None or row[0] != self.config:
+            db.execute('DELETE FROM conversions')
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('config', ?)",
+                       (self.config,))
+            db.commit()
+        self._results = dict(
+            ((Style(*json.loads(style)), text), result)
+            for style, text, result in
+            db.execute('SELECT style, text, result FROM conversions LIMIT ?',
+                       (self.cache_size,)))
+        self._db = db
+
+    def convert(self, text, style):
+        """Return text converted to style, from the cache if possible."""
+        results = self._results
+        if results is None:
+            with self._lock:
+                if self._results is None:
+                    self._load()
+                results = self._results
+        style = _resolve_style(style)
+        key = (style, text)
+        try:
+            return results[key]
+        except KeyError:
+            pass
+        result = self._converter.convert(text, style.name)
+        with self._lock:
+            if results is not self._results:
+                # Closed by another thread since the lookup.
+                return result
+            if key not in results:
+                if len(results) >= self.cache_size:
+                    results.clear()
+                results[key] = result
+                self._pending.append((json.dumps(style), text, result))
+                if len(self._pending) >= self.flush_size:
+                    self._flush()
+        return result
+
+    def flush(self):
+        """Write new conversions to the file."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self._pending and self._db is not None:
+            self._db.executemany(
+                'INSERT OR REPLACE INTO conversions VALUES (?, ?, ?)',
+                self._pending)
+            self._db.commit()
+            self._pending = []
+
+    def close(self):
+        """Flush new conversions and close the file."""
+        with self._lock:
+            if self._db is not None:
+                self._flush()
+                self._db.close()
+                self._db = None
+                self._results = None
@@ -0,0 +1,135 @@
+import re
+import sys
+
+PYTHON = sys.version_info[0]
+
+if 3 == PYTHON:
+    # Python 3 and ST3
+    from .case_conversion import CaseConverter
+    string_types = str
+else:
+    # Python 2 and ST2
+    from case_conversion import CaseConverter
+    string_types = basestring  # noqa: F821
+
+# A run of word characters that doesn't start with a digit and isn't part
+# of a longer run, e.g. not the "abc" of "123abc".
+IDENTIFIER = re.compile(r'\b(?!\d)\w+', re.UNICODE)
+# A (possibly empty) run of word characters.
+WORD_RUN = re.compile(r'\w*', re.UNICODE)
+
+# Runs of word characters longer than this are data (minified code, base64
+# blobs), not identifiers, and are copied as is. This also bounds what is
+# held back between chunks.
+_MAX_IDENTIFIER = 1 << 12
+
+# Number of converted identifiers memoized before the memo is cleared, so
+# documents with unbounded distinct identifiers run in bounded memory.
+_MEMO_SIZE = 1 << 16
+
+
+def rewrite_identifiers(source, style, predicate=None, acronyms=None,
+                        out=None, chunk_size=1 << 16):
+    """Convert every identifier in a document to the given style.
+
+    Identifiers are found in a single regex pass, and each distinct one is
+    converted only once. File objects are read chunk_size characters at a
+    time; an identifier cut by a chunk boundary is held back and completed
+    with the next chunk, so files of any size can be rewritten to out
+    without loading them whole. Identifiers longer than 4096 characters
+    are left as they are.
+
+    Args:
+        source: text, or a file object opened in text mode
+        style: style name, e.g. "camel" or "camelcase"
+        predicate: function called with each identifier, returning whether
+                   to convert it (default: convert all)
+        acronyms: a list of acronyms to detect
+        out: file object to write the rewritten text to, chunk by chunk
+        chunk_size: number of characters read from source at a time
+
+    Returns:
+        The rewritten text, or None if it was written to out.
+
+    >>> rewrite_identifiers("user_id = get_user(request_id)", "camel")
+    'userId = getUser(requestId)'
+    """
+    convert = CaseConverter(acronyms, 0).converter(style)
+    memo = {}
+
+    def replace(match):
+        identifier = match.group()
+        if len(identifier) > _MAX_IDENTIFIER:
+            return identifier
+        try:
+            return memo[identifier]
+        except KeyError:
+            pass
+        if predicate is None or predicate(identifier):
+            result = convert(identifier)
+        else:
+            result = identifier
+        if len(memo) >= _MEMO_SIZE:
+            memo.clear()
+        memo[identifier] = result
+        return result
+
+    if isinstance(source, string_types):
+        chunks = [IDENTIFIER.sub(replace, source)]
+    else:
+        chunks = _rewrite_chunks(source, replace, chunk_size)
+    if out is None:
+        return ''.join(chunks)
+    for chunk in chunks:
+        out.write(chunk)
+
+
+def _is_word_char(c):
+    """Return whether c is matched by \\w."""
+    return c.isalnum() or c == '_'
+
+
+def _rewrite_chunks(source, replace, chunk_size):
+    """Yield rewritten text, reading source in chunks."""
+    carry = ''
+    # Whether the previous chunk ended inside an over-long run.
+    in_long_run = False
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        if in_long_run:
+            # Copy the rest of the run as is.
+            end = WORD_RUN.match(chunk).end()
+            if end == len(chunk):
+                yield chunk
+                continue
+            yield chunk[:end]
+            chunk = chunk[end:]
+            in_long_run = False
+        # Hold back a trailing run of word characters: it may continue in
+        # the next chunk. What's left ends at a non-word character, so no
+        # identifier crosses the cut. The held-back carry is all word
+        # characters, so only the new chunk is scanned, and no further than
+        # _MAX_IDENTIFIER characters back.
+        cut = len(chunk)
+        limit = max(cut - _MAX_IDENTIFIER - 1, 0)
+        while cut > limit and _is_word_char(chunk[cut - 1]):
+            cut -= 1
+        run = len(chunk) - cut
+        if cut == 0:
+            run += len(carry)
+        text = carry + chunk
+        if run > _MAX_IDENTIFIER:
+            # Too long to be an identifier: replace() leaves it as is, and
+            # its continuation in the next chunks is copied.
+            carry = ''
+            in_long_run = True
+            yield IDENTIFIER.sub(replace, text)
+            continue
+        cut = len(text) - run
+        carry = text[cut:]
+        if cut:
+            yield IDENTIFIER.sub(replace, text[:cut])
+    if carry:
+        yield IDENTIFIER.sub(replace, carry)
@@ -0,0 +1,118 @@
+from collections import namedtuple
+import operator
+import sys
+
+
+class Style(namedtuple('Style', ['name', 'separator', 'word', 'first_word',
+                                 'preserve_case'])):
+    """
+    Declaration of a case style.
+
+    Attributes:
+        name -- the style's name, e.g. "snakecase"
+        separator -- string put between words, e.g. "_"
+        word -- rule casing each word, a key of WORD_RULES
+        first_word -- rule casing the first word
+        preserve_case -- whether words keep their original case, instead of
+                         being normalized to PascalCase (known acronyms
+                         upper-case) before the rules apply
+    """
+
+    __slots__ = ()
+
+
+if sys.version_info[0] >= 3:
+    # Unbound str methods are the fastest functions to map over words.
+    _lower, _upper, _capitalize = str.lower, str.upper, str.capitalize
+else:
+    # Words may be str or unicode on Python 2.
+    _lower, _upper, _capitalize = [operator.methodcaller(name) for name in
+                                   ('lower', 'upper', 'capitalize')]
+
+# How a rule cases a word, or None to leave it as is.
+WORD_RULES = {
+    'keep': None,
+    'lower': _lower,
+    'upper': _upper,
+    'capitalize': _capitalize,
+}
+
+# Registered styles by name and alias, and their renderers by style.
+_styles = {}
+_renderers = {}
+
+
+def _renderer(style):
+    """Return a function joining a sequence of words in style."""
+    separator = style.separator
+    rule = WORD_RULES[style.word]
+    first_rule = WORD_RULES[style.first_word]
+    if first_rule is rule:
+        if rule is None:
+            return separator.join
+        return lambda words: separator.join(map(rule, words))
+
+    def render(words):
+        if not words:
+            return separator[:0]
+        first = words[0] if first_rule is None else first_rule(words[0])
+        rest = words[1:] if rule is None else map(rule, words[1:])
+        return separator.join([first] + list(rest))
+    return render
+
+
+def register(style, aliases=()):
+    """
+    Add style to the registry, under its name and every alias.
+
+    Registering a style that is already registered only adds the aliases.
+    Raises ValueError if a name is taken by another style or a rule is
+    unknown.
+    """
+    for rule in (style.word, style.first_word):
+        if rule not in WORD_RULES:
+            raise ValueError(
+                "Case Conversion: unknown word rule '{}'.".format(rule))
+    names = (style.name,) + tuple(aliases)
+    for name in names:
+        if _styles.get(name, style) != style:
+            raise ValueError(
+                "Case Conversion: style '{}' already exists.".format(name))
+    if style not in _renderers:
+        _renderers[style] = _renderer(style)
+    for name in names:
+        _styles[name] = style
+
+
+def get(name):
+    """Return the registered Style called name (or aliased so)."""
+    try:
+        return _styles[name]
+    except (KeyError, TypeError):
+        raise ValueError("Case Conversion: unknown style '{}'.".format(name))
+
+
+def names():
+    """Return all registered style names and aliases."""
+    return list(_styles)
+
+
+def renderer(style):
+    """Return the function joining words in a registered style."""
+    return _renderers[style]
+
+
+for _name, _separator, _word, _first_word, _preserve_case, _aliases in (
+        ('camelcase', '', 'keep', 'lower', False, ('camel',)),
+        ('pascalcase', '', 'keep', 'keep', False, ('pascal',)),
+        ('snakecase', '_', 'lower', 'lower', False, ('snake',)),
+        ('dashcase', '-', 'lower', 'lower', False,
+         ('dash', 'kebab', 'kebabcase', 'spinal', 'spinalcase')),
+        ('constcase', '_', 'upper', 'upper', False,
+         ('const', 'screaming_snake', 'screaming_snakecase')),
+        ('dotcase', '.', 'lower', 'lower', False, ('dot',)),
+        ('separate_words', ' ', 'keep', 'keep', True, ()),
+        ('slashcase', '/', 'keep', 'keep', True, ('slash',)),
+        ('backslashcase', '\\', 'keep', 'keep', True, ('backslash',))):
+    register(Style(_name, _separator, _word, _first_word, _preserve_case),
+             _aliases)
@@ -2,10 +2,32 @@
 """Unit test for case-conversion
 """
 
+import io
+import itertools
+import json
+import sys
+import os
+import pickle
+import shutil
+import subprocess
+import tempfile
+import threading
+import timeit
+
 import case_conversion
-from unittest import TestCase
+from case_conversion import case_parse, styles
+from case_conversion.cache import ShardedLRUCache
+from case_conversion.__main__ import main
+from unittest import TestCase, skipIf
 from parameterized import parameterized
 
+if sys.version_info >= (3, 6):
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+if sys.version_info[0] >= 3:
+    unichr = chr
+
 ACRONYMS = ['HTTP']
 ACRONYMS_UNICODE = [u'HÉÉP']
 
@@ -401,6 +423,1048 @@ class CaseConversionTest(TestCase):
         result = case_converter(value, acronyms=ACRONYMS_UNICODE)
         self.assertEqual(result, expected)
 
+    @parameterized.expand([(case, case) for case in CASES + CASES_PRESERVE])
+    def test_pickle(self, _, case):
+        """Test that converters pickle by reference, e.g. for process pools."""
+        case_converter = getattr(case_conversion, case)
+        self.assertIs(pickle.loads(pickle.dumps(case_converter)),
+                      case_converter)
+
+
+class CaseConverterTest(TestCase):
+    @parameterized.expand(_expand_values(VALUES_ACRONYM))
+    def test_acronyms(self, _, case, value, expected):
+        """
+        Test that CaseConverter methods match the module-level converters
+        (with acronym detection).
+        """
+        converter = case_conversion.CaseConverter(acronyms=ACRONYMS)
+        case_converter = getattr(converter, case)
+        self.assertEqual(case_converter(value), expected)
+        # Second call is served from the cache.
+        self.assertEqual(case_converter(value), expected)
+
+    @parameterized.expand(
+        _expand_values_preserve(PRESERVE_VALUES, VALUES))
+    def test_preserve_case_uncached(self, _, case, value, expected):
+        """
+        Test CaseConverter methods that preserve capital/lower case letters
+        with caching disabled.
+        """
+        converter = case_conversion.CaseConverter(cache_size=0)
+        case_converter = getattr(converter, case)
+        self.assertEqual(case_converter(value), expected)
+
+
+class StyleRegistryTest(TestCase):
+    def setUp(self):
+        # Registering the same declaration again is allowed.
+        case_conversion.register_style('train', '-', aliases=['Train-Case'])
+        case_conversion.register_style('path', '::', word='lower')
+
+    @parameterized.expand(
+        [(name + '2' + case, case, value)
+         for case in CASES + CASES_PRESERVE
+         for name, value in VALUES_ACRONYM.items()])
+    def test_convert(self, _, case, value):
+        """Test that convert() matches the converter of each style."""
+        expected = getattr(case_conversion, case)(value, ACRONYMS)
+        self.assertEqual(case_conversion.convert(value, case, ACRONYMS),
+                         expected)
+
+    def test_aliases(self):
+        """Test that aliases are the converters they stand for."""
+        self.assertEqual(case_conversion.convert('fooBar', 'kebab'),
+                         'foo-bar')
+        self.assertEqual(case_conversion.convert('fooBar', 'screaming_snake'),
+                         'FOO_BAR')
+        self.assertIs(case_conversion.kebabcase, case_conversion.dashcase)
+        self.assertIs(case_conversion.spinalcase, case_conversion.dashcase)
+        self.assertIs(case_conversion.screaming_snakecase,
+                      case_conversion.constcase)
+
+    def test_custom_styles(self):
+        """Test that custom styles work wherever a style name does."""
+        text = 'fooBarHTTPError'
+        for style, expected in (('Train-Case', 'Foo-Bar-HTTP-Error'),
+                                ('path', 'foo::bar::http::error')):
+            self.assertEqual(case_conversion.convert(text, style, ACRONYMS),
+                             expected)
+            self.assertEqual(
+                case_conversion.compile_converter(style, ACRONYMS)(text),
+                expected)
+            self.assertEqual(
+                case_conversion.CaseConverter(ACRONYMS).convert(text, style),
+                expected)
+            self.assertEqual(
+                case_conversion.convert_many([text], style, ACRONYMS,
+                                             threads=2),
+                [expected])
+            parsed = case_parse.parse_case(text, ACRONYMS, as_object=True)
+            self.assertEqual(parsed.render(style), expected)
+            self.assertTrue(case_conversion.is_case(expected, style,
+                                                    ACRONYMS))
+        self.assertTrue(case_conversion.is_case('foo::bar1', 'path'))
+        self.assertFalse(case_conversion.is_case('foo_bar', 'path'))
+        self.assertEqual(
+            case_conversion.convert_keys({'userId': 1}, 'Train-Case'),
+            {'User-Id': 1})
+
+    def test_invalid(self):
+        """Test that unknown styles, rules and name clashes are rejected."""
+        self.assertRaises(ValueError, case_conversion.convert, 'fooBar',
+                          'upside_down')
+        self.assertRaises(ValueError, case_conversion.register_style,
+                          'snake', '-')
+        self.assertRaises(ValueError, case_conversion.register_style,
+                          'sarcastic', word='alternate')
+
+
+class CompileConverterTest(TestCase):
+    @parameterized.expand(
+        [(name + '2' + case, case, value, acronyms)
+         for case in CASES + CASES_PRESERVE
+         for values, acronyms in ((VALUES, None),
+                                  (VALUES_UNICODE, None),
+                                  (VALUES_ACRONYM, ACRONYMS),
+                                  (VALUES_ACRONYM_UNICODE, ACRONYMS_UNICODE))
+         for name, value in values.items()])
+    def test_matches_converters(self, _, case, value, acronyms):
+        """Test that compiled converters match the module-level ones."""
+        compiled = case_conversion.compile_converter(case, acronyms)
+        case_converter = getattr(case_conversion, case)
+        self.assertEqual(compiled(value), case_converter(value, acronyms))
+        self.assertEqual(compiled(''), '')
+
+
+class ParseCacheTest(TestCase):
+    def setUp(self):
+        case_parse.set_cache_size(2)
+
+    def tearDown(self):
+        case_parse.set_cache_size(None)
+
+    def test_hits_and_misses(self):
+        """Test that repeated parses are served from the cache."""
+        first = case_parse.parse_case('fooBar', ACRONYMS)
+        second = case_parse.parse_case('fooBar', ['http'])
+        self.assertEqual(first, second)
+        self.assertEqual(case_parse.cache_info(), (1, 1, 2, 1))
+        case_parse.cache_clear()
+        self.assertEqual(case_parse.cache_info(), (0, 0, 2, 0))
+
+    def test_returns_copies(self):
+        """Test that mutating a result doesn't corrupt the cached words."""
+        words, _case, _sep = case_parse.parse_case('fooBar')
+        words.append('Baz')
+        self.assertEqual(case_parse.parse_case('fooBar')[0], ['Foo', 'Bar'])
+
+    def test_lru_eviction(self):
+        """Test that the least recently used result is evicted first."""
+        case_parse.parse_case('foo')
+        case_parse.parse_case('bar')
+        case_parse.parse_case('foo')
+        case_parse.parse_case('baz')
+        case_parse.parse_case('foo')
+        case_parse.parse_case('bar')
+        self.assertEqual(case_parse.cache_info(), (2, 4, 2, 2))
+
+    def test_disabled(self):
+        """Test that no statistics are kept while the cache is disabled."""
+        case_parse.set_cache_size(0)
+        self.assertEqual(case_conversion.snakecase('fooBar'), 'foo_bar')
+        self.assertIsNone(case_parse.cache_info())
+
+
+class ShardedLRUCacheTest(TestCase):
+    def test_small_cache_is_exact(self):
+        """Test that small caches keep exact LRU order in one shard."""
+        cache = ShardedLRUCache(2)
+        cache.put('foo', 1)
+        cache.put('bar', 2)
+        self.assertEqual(cache.get('foo'), 1)
+        cache.put('baz', 3)
+        self.assertIsNone(cache.get('bar'))
+        self.assertEqual(cache.info(), (1, 1, 2, 2))
+
+    def test_reinsert(self):
+        """Test the LRU order kept by the Python 2 fallback."""
+        cache = ShardedLRUCache(2)
+        shard = cache._shards[0]
+        shard._touch = shard._reinsert
+        cache.put('foo', 1)
+        cache.put('bar', 2)
+        self.assertEqual(cache.get('foo'), 1)
+        cache.put('baz', 3)
+        self.assertIsNone(cache.get('bar'))
+        self.assertEqual(cache.get('foo'), 1)
+
+    def test_invalid_size(self):
+        """Test that sizes with no room for an entry are rejected."""
+        self.assertRaises(ValueError, ShardedLRUCache, 0)
+        self.assertRaises(ValueError, ShardedLRUCache, -1)
+        self.assertRaises(ValueError, case_parse.set_cache_size, -1)
+        self.assertEqual(case_conversion.snakecase('fooBar'), 'foo_bar')
+
+    def test_sharded(self):
+        """Test that sharded caches keep maxsize and summed statistics."""
+        cache = ShardedLRUCache(1000, shards=8)
+        for i in range(2000):
+            cache.put(i, str(i))
+        self.assertTrue(len(cache) <= 1000)
+        self.assertEqual(cache.get(1999), '1999')
+        self.assertEqual(cache.info().hits, 1)
+        cache.clear()
+        self.assertEqual(cache.info(), (0, 0, 1000, 0))
+
+
+class ThreadSafetyTest(TestCase):
+    THREADS = 8
+
+    def setUp(self):
+        case_parse.set_cache_size(256)
+
+    def tearDown(self):
+        case_parse.set_cache_size(None)
+
+    def _run(self, target):
+        errors = []
+
+        def run():
+            try:
+                target()
+            except Exception as e:
+                errors.append(e)
+        threads = [threading.Thread(target=run) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_shared_converter_and_cache(self):
+        """Test that threads sharing converters and caches agree."""
+        texts = ['fooBar{}HTTPError'.format(i % 300) for i in range(2000)]
+        expected = [case_conversion.snakecase(t, ACRONYMS) for t in texts]
+        converter = case_conversion.CaseConverter(ACRONYMS, cache_size=128)
+
+        def target():
+            self.assertEqual([converter.snakecase(t) for t in texts],
+                             expected)
+            self.assertEqual([case_conversion.snakecase(t, ACRONYMS)
+                              for t in texts], expected)
+        self._run(target)
+        self.assertTrue(len(converter._cache) <= 128)
+
+    def test_stats(self):
+        """Test that statistics from all threads are counted."""
+        case_parse.enable_stats()
+        try:
+            self._run(lambda: [case_parse.parse_case('fooBar')
+                               for _ in range(100)])
+            self.assertEqual(case_parse.stats()['calls'],
+                             100 * self.THREADS)
+        finally:
+            case_parse.disable_stats()
+
+
+class ConvertManyTest(TestCase):
+    @parameterized.expand([(case, case) for case in CASES + CASES_PRESERVE])
+    def test_matches_converters(self, _, case):
+        """Test that batch conversion matches the single-string converters."""
+        texts = list(VALUES_ACRONYM.values()) * 2
+        expected = [getattr(case_conversion, case)(t, acronyms=ACRONYMS)
+                    for t in texts]
+        self.assertEqual(
+            case_conversion.convert_many(texts, case, acronyms=ACRONYMS),
+            expected)
+
+    def test_stream(self):
+        """Test that streaming mode lazily yields converted strings."""
+        result = case_conversion.convert_many(iter(['fooBar', 'FOO_BAR']),
+                                              'const', stream=True)
+        self.assertFalse(isinstance(result, list))
+        self.assertEqual(list(result), ['FOO_BAR', 'FOO_BAR'])
+
+    def test_processes(self):
+        """Test that the process pool mode keeps results in input order."""
+        texts = ['fooBar{}HTTPError'.format(i) for i in range(50)]
+        expected = case_conversion.convert_many(texts, 'snake', ACRONYMS)
+        result = case_conversion.convert_many(
+            iter(texts), 'snake', ACRONYMS, processes=2, chunk_size=7)
+        self.assertEqual(result, expected)
+
+    def test_processes_without_initializer(self):
+        """Test the process pool mode of Pythons without initializers."""
+        texts = ['fooBar{}HTTPError'.format(i) for i in range(50)]
+        expected = case_conversion.convert_many(texts, 'snake', ACRONYMS)
+        batch = sys.modules['case_conversion.batch']
+        batch._POOL_INITIALIZER = False
+        try:
+            result = case_conversion.convert_many(
+                iter(texts), 'snake', ACRONYMS, processes=2, chunk_size=7)
+        finally:
+            batch._POOL_INITIALIZER = sys.version_info >= (3, 7)
+        self.assertEqual(result, expected)
+
+    def test_threads(self):
+        """Test that the thread pool mode keeps results in input order."""
+        texts = ['fooBar{}HTTPError'.format(i) for i in range(50)] * 2
+        expected = case_conversion.convert_many(texts, 'snake', ACRONYMS)
+        result = case_conversion.convert_many(
+            iter(texts), 'snake', ACRONYMS, threads=4, chunk_size=7)
+        self.assertEqual(result, expected)
+
+    def test_unknown_style(self):
+        """Test that unknown style names are rejected."""
+        self.assertRaises(ValueError, case_conversion.convert_many,
+                          ['fooBar'], 'upside_down')
+
+
+PARSED_IDENTIFIER_STYLES = {
+    'camel': 'camelcase',
+    'pascal': 'pascalcase',
+    'snake': 'snakecase',
+    'dash': 'dashcase',
+    'kebab': 'kebabcase',
+    'spinal': 'spinalcase',
+    'const': 'constcase',
+    'screaming_snake': 'screaming_snakecase',
+    'dot': 'dotcase',
+    'separate_words': 'separate_words',
+    'slash': 'slashcase',
+    'backslash': 'backslashcase',
+}
+
+
+class ParsedIdentifierTest(TestCase):
+    @parameterized.expand([
+        (name + '2' + style, style, value)
+        for name, value in VALUES_ACRONYM.items()
+        for style in PARSED_IDENTIFIER_STYLES])
+    def test_render(self, _, style, value):
+        """Test that every rendered style matches its converter."""
+        parsed = case_parse.parse_case(value, ACRONYMS, as_object=True)
+        case_converter = getattr(case_conversion,
+                                 PARSED_IDENTIFIER_STYLES[style])
+        self.assertEqual(getattr(parsed, style),
+                         case_converter(value, acronyms=ACRONYMS))
+
+    def test_matches_parse_case(self):
+        """Test that words, case and separator match parse_case."""
+        for preserve_case in (False, True):
+            words, case, sep = case_parse.parse_case(
+                'FOO_HTTP_BAR', ACRONYMS, preserve_case=preserve_case)
+            parsed = case_parse.parse_case(
+                'FOO_HTTP_BAR', ACRONYMS, preserve_case=preserve_case,
+                as_object=True)
+            self.assertEqual(parsed.words, tuple(words))
+            self.assertEqual(parsed.case, case)
+            self.assertEqual(parsed.separator, sep)
+
+    def test_render_cached(self):
+        """Test that a rendered style is computed only once."""
+        parsed = case_parse.parse_case('fooBar', as_object=True)
+        self.assertIs(parsed.snake, parsed.snake)
+        self.assertRaises(AttributeError, setattr, parsed, 'extra', 1)
+
+
+class LazyCaseTest(TestCase):
+    def setUp(self):
+        self.determined = []
+        self._determine_case = case_parse._determine_case
+
+        def determine_case(was_upper, words, string):
+            self.determined.append(string)
+            return self._determine_case(was_upper, words, string)
+        case_parse._determine_case = determine_case
+
+    def tearDown(self):
+        case_parse._determine_case = self._determine_case
+
+    def test_tuple(self):
+        """Test that parse_case returns a plain tuple."""
+        result = case_parse.parse_case('FOO_HTTP_BAR', ACRONYMS)
+        self.assertIs(type(result), tuple)
+        self.assertEqual(result + (), (['Foo', 'HTTP', 'Bar'], 'upper', '_'))
+        self.assertEqual(self.determined, ['FOO_HTTP_BAR'])
+
+    def test_parsed_identifier_lazy(self):
+        """Test that a ParsedIdentifier determines its case when read."""
+        parsed = case_parse.parse_case('fooBar', as_object=True)
+        self.assertEqual(parsed.snake, 'foo_bar')
+        self.assertEqual(self.determined, [])
+        self.assertEqual(parsed.case, 'camel')
+        self.assertEqual(parsed.case, 'camel')
+        self.assertEqual(self.determined, ['fooBar'])
+
+    def test_converters_skip_case(self):
+        """Test that converters never determine the case type."""
+        for case in CASES + CASES_PRESERVE:
+            getattr(case_conversion, case)('fooBar_baz', ACRONYMS)
+        self.assertEqual(self.determined, [])
+
+    def test_separator(self):
+        """Test the separator of strings with and without separators."""
+        for value, sep in (('fooBar', ''), ('foo-bar_baz', '-'),
+                           ('FOO.BAR', '.'), ('', '')):
+            self.assertEqual(case_parse.parse_case(value)[2], sep)
+            self.assertEqual(
+                case_parse.parse_case(value, as_object=True).separator, sep)
+
+
+class LetterRunScalingTest(TestCase):
+    @staticmethod
+    def _time(length, acronyms):
+        text = 'a' + 'B' * length
+        return min(timeit.repeat(
+            lambda: case_parse.parse_case(text, acronyms),
+            number=1, repeat=3))
+
+    @parameterized.expand([('simple', None), ('acronyms', ['XY'])])
+    def test_linear(self, _, acronyms):
+        """
+        Test that grouping a run of capitals scales linearly with its length.
+        A quadratic grouping takes over 400 times longer on a run 64 times
+        as long; allow up to 3 times the linear ratio for timing noise.
+        """
+        short_run = self._time(2000, acronyms)
+        long_run = self._time(128000, acronyms)
+        self.assertLess(long_run / short_run, 64 * 3)
+
+
+class AsciiFastPathTest(TestCase):
+    def setUp(self):
+        self._isascii = case_parse._isascii
+
+    def tearDown(self):
+        case_parse._isascii = self._isascii
+
+    @parameterized.expand(
+        [(name, value, acronyms)
+         for name, value in VALUES_ACRONYM.items()
+         for acronyms in (None, ACRONYMS)] +
+        [('punctuation', 'foo@Bar!!HTTP42x~', ACRONYMS),
+         ('letter_run', 'aBCDEFGH1_IJ', None)])
+    def test_matches_unicode_path(self, _, value, acronyms):
+        """Test that ASCII input parses identically on both paths."""
+        self.assertTrue(case_parse._isascii(value))
+        fast = case_parse.parse_case(value, acronyms)
+        case_parse._isascii = lambda string: False
+        self.assertEqual(case_parse.parse_case(value, acronyms), fast)
+
+
+class LazyImportTest(TestCase):
+    @skipIf(sys.version_info < (3, 7), 'needs module __getattr__')
+    def test_slow_modules_not_imported(self):
+        """
+        Test that importing the package doesn't import asyncio or sqlite3
+        until their exports are used.
+        """
+        code = ('import sys, case_conversion; '
+                'print(sorted(m for m in ("asyncio", "sqlite3") '
+                'if m in sys.modules)); '
+                'case_conversion.PersistentCache; '
+                'print("sqlite3" in sys.modules)')
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         universal_newlines=True)
+        self.assertEqual(output.split('\n'), ['[]', 'True', ''])
+
+
+class CommandLineTest(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, name, text):
+        path = os.path.join(self.tmpdir, name)
+        with io.open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def test_stdin(self):
+        """Test converting identifiers read from stdin."""
+        stdin = io.StringIO(u'fooBar\r\nHTTPError\n\nfóo-bar')
+        stdout = io.StringIO()
+        main(['--to', 'snake'], stdin, stdout)
+        self.assertEqual(stdout.getvalue(),
+                         u'foo_bar\nhttp_error\n\nfóo_bar\n')
+
+    def test_files_and_acronyms(self):
+        """Test converting files with acronyms read from a file."""
+        acronyms = self._write('acronyms.txt', u'# web\nhttp\n\nJSON\n')
+        first = self._write('first.txt', u'http_error\n')
+        second = self._write('second.txt', u'json_body\nfoo\n')
+        stdout = io.StringIO()
+        main(['--to', 'pascalcase', '--acronyms', acronyms, first, second],
+             io.StringIO(), stdout)
+        self.assertEqual(stdout.getvalue(), u'HTTPError\nJSONBody\nFoo\n')
+
+    def test_cache(self):
+        """Test converting with a persistent cache file."""
+        cache = os.path.join(self.tmpdir, 'cache.db')
+        for _ in range(2):
+            stdout = io.StringIO()
+            main(['--to', 'dot', '--cache', cache],
+                 io.StringIO(u'fooBar\nbaz_qux\n'), stdout)
+            self.assertEqual(stdout.getvalue(), u'foo.bar\nbaz.qux\n')
+        self.assertTrue(os.path.exists(cache))
+
+
+class ConvertKeysTest(TestCase):
+    def test_nested(self):
+        """Test that keys are converted at every level and values kept."""
+        payload = {
+            'user_id': 1,
+            'http_headers': [{'content_type': 'text/plain'}, 'raw_value'],
+            'pair': ({'left_key': None}, 2),
+            3: 'int_key',
+        }
+        self.assertEqual(
+            case_conversion.convert_keys(payload, 'camel', acronyms=ACRONYMS),
+            {
+                'userId': 1,
+                'httpHeaders': [{'contentType': 'text/plain'}, 'raw_value'],
+                'pair': ({'leftKey': None}, 2),
+                3: 'int_key',
+            })
+
+    def test_deep_nesting(self):
+        """Test that nesting deeper than the recursion limit is handled."""
+        payload = node = []
+        for _ in range(10000):
+            node.append({'next_node': []})
+            node = node[0]['next_node']
+        result = case_conversion.convert_keys(payload, 'camelcase')
+        for _ in range(10000):
+            result = result[0]['nextNode']
+        self.assertEqual(result, [])
+
+    def test_skip(self):
+        """Test that skipped key paths are kept without converting."""
+        payload = {'meta_data': {'raw_blob': {'keep_me': 1}},
+                   'items': [{'raw_blob': {'keep_me': 2}}]}
+        result = case_conversion.convert_keys(
+            payload, 'dash', skip=[('meta_data', 'raw_blob'),
+                                   ('items', 'raw_blob')])
+        self.assertEqual(result, {'meta-data': {'raw-blob': {'keep_me': 1}},
+                                  'items': [{'raw-blob': {'keep_me': 2}}]})
+        # Skipped subtrees are shared with the input.
+        self.assertIs(result['meta-data']['raw-blob'],
+                      payload['meta_data']['raw_blob'])
+
+    def test_shared_cache(self):
+        """Test that a shared cache is filled and reused across calls."""
+        cache = {}
+        case_conversion.convert_keys({'foo_bar': 1}, 'camel', cache=cache)
+        self.assertEqual(cache, {'foo_bar': 'fooBar'})
+        cache['foo_bar'] = 'cached'
+        self.assertEqual(
+            case_conversion.convert_keys([{'foo_bar': 1}], 'camel',
+                                         cache=cache),
+            [{'cached': 1}])
+
+
+class ConvertJsonKeysTest(TestCase):
+    DOCUMENT = (u'{"userId": 1, "userName": "fooBar", "HTTPStatus": null,\n'
+                u' "tags": [{"tagName": "a\\"b,{}[]"}, [1.50e+3, "x"]],\n'
+                u' "escaped\\u004bey": {"innerKey": "\\u0041", "": []}}')
+    EXPECTED = (u'{"user_id": 1, "user_name": "fooBar", "http_status": null,\n'
+                u' "tags": [{"tag_name": "a\\"b,{}[]"}, [1.50e+3, "x"]],\n'
+                u' "escaped_key": {"inner_key": "\\u0041", "": []}}')
+
+    def test_text(self):
+        """Test that only keys change, and values are copied verbatim."""
+        self.assertEqual(
+            case_conversion.convert_json_keys(self.DOCUMENT, 'snake',
+                                              ACRONYMS),
+            self.EXPECTED)
+
+    @parameterized.expand([(str(size), size) for size in (1, 2, 3, 7, 64)])
+    def test_chunked(self, _, chunk_size):
+        """Test keys, strings and escapes cut by chunk boundaries."""
+        out = io.StringIO()
+        self.assertIsNone(case_conversion.convert_json_keys(
+            io.StringIO(self.DOCUMENT), 'snake', ACRONYMS, out=out,
+            chunk_size=chunk_size))
+        self.assertEqual(out.getvalue(), self.EXPECTED)
+
+        out = io.BytesIO()
+        case_conversion.convert_json_keys(
+            io.BytesIO(self.DOCUMENT.encode('utf-8')), 'snake', ACRONYMS,
+            out=out, chunk_size=chunk_size)
+        self.assertEqual(out.getvalue(), self.EXPECTED.encode('utf-8'))
+
+    def test_text_to_out(self):
+        """Test that text sources are written to out when it is given."""
+        out = io.StringIO()
+        self.assertIsNone(case_conversion.convert_json_keys(
+            self.DOCUMENT, 'snake', ACRONYMS, out=out))
+        self.assertEqual(out.getvalue(), self.EXPECTED)
+
+    @parameterized.expand([(str(size), size) for size in (1, 7, 1 << 16)])
+    def test_buffers(self, _, chunk_size):
+        """Test bytearray and memoryview sources, converted to bytes."""
+        document = self.DOCUMENT.encode('utf-8')
+        for source in (bytearray(document), memoryview(document)):
+            self.assertEqual(
+                case_conversion.convert_json_keys(source, 'snake', ACRONYMS,
+                                                  chunk_size=chunk_size),
+                self.EXPECTED.encode('utf-8'))
+        self.assertEqual(
+            case_conversion.convert_json_keys(bytearray(), 'snake'), b'')
+
+    def test_escaped_output(self):
+        """Test that converted keys are escaped where JSON needs it."""
+        self.assertEqual(
+            case_conversion.convert_json_keys(u'{"fooBar": [{"x": 1}]}',
+                                              'backslash'),
+            u'{"foo\\\\Bar": [{"x": 1}]}')
+
+
+class ParseSpansTest(TestCase):
+    def test_spans(self):
+        """Test that spans are offsets of the words in the string."""
+        spans, case = case_parse.parse_spans('fooHTTPBar_baz', ACRONYMS)
+        self.assertEqual(list(spans), [0, 3, 3, 7, 7, 10, 11, 14])
+        self.assertEqual(case, 'mixed')
+
+    @parameterized.expand(
+        [(name, value, acronyms)
+         for name, value in VALUES_ACRONYM_UNICODE.items()
+         for acronyms in (None, ACRONYMS_UNICODE)] +
+        [('letter_runs', u'aÉBC_D_EFgh', ['EF']),
+         ('upper', u'FÓO_HÉÉP', ACRONYMS_UNICODE),
+         ('upper_without_lower', u'\U0001d400\U0001d400', [u'É']),
+         ('upper_runs', u'FOO_\U0001d400\U0001d400B', None)])
+    def test_matches_parse_case(self, _, value, acronyms):
+        """Test that spans delimit the words found by parse_case."""
+        words, case, _sep = case_parse.parse_case(value, acronyms,
+                                                  preserve_case=True)
+        spans, spans_case = case_parse.parse_spans(value, acronyms)
+        self.assertEqual([value[spans[i]:spans[i + 1]]
+                          for i in range(0, len(spans), 2)], words)
+        self.assertEqual(spans_case, case)
+
+
+class DetectCaseTest(TestCase):
+    @parameterized.expand(
+        [(name, value, acronyms)
+         for values in (VALUES, VALUES_UNICODE, VALUES_ACRONYM)
+         for name, value in values.items()
+         for acronyms in (None, ACRONYMS)] +
+        [('mixed', 'foo_Bar-baz', None), ('digits', '1_a', None),
+         ('empty', '', None), ('separators', '_-_', None)])
+    def test_matches_parse_case(self, _, value, acronyms):
+        """Test that detect_case agrees with the case type of parse_case."""
+        self.assertEqual(case_conversion.detect_case(value, acronyms),
+                         case_parse.parse_case(value, acronyms)[1])
+
+
+class IsCaseTest(TestCase):
+    @parameterized.expand([(case, case) for case in CASES + CASES_PRESERVE])
+    def test_exhaustive(self, _, case):
+        """
+        Test that is_case and the converters' shortcut for text already in
+        their style agree with a full conversion, for every short string
+        over a small alphabet.
+        """
+        style = styles.get(case)
+        render = styles.renderer(style)
+        case_converter = getattr(case_conversion, case)
+        texts = [''.join(chars) for n in range(5)
+                 for chars in itertools.product('aAB1_-.', repeat=n)]
+        for acronyms in (None, ['AB']):
+            fast = [(case_converter(t, acronyms),
+                     case_conversion.is_case(t, case, acronyms))
+                    for t in texts]
+            full = [render(case_parse.parse_case(t, acronyms,
+                                                 style.preserve_case)[0])
+                    for t in texts]
+            self.assertEqual(fast, [(f, f == t) for t, f in zip(texts, full)])
+
+    def test_unicode(self):
+        """Test is_case with non-ASCII text."""
+        for case, value in VALUES_UNICODE.items():
+            self.assertTrue(case_conversion.is_case(value, case))
+        self.assertFalse(case_conversion.is_case(u'fóoBar', 'snake'))
+
+
+class _AsyncSource(object):
+    """Async iterator over items, raising error once they run out."""
+
+    def __init__(self, items, error=None):
+        self.items = iter(items)
+        self.error = error
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        for item in self.items:
+            return asyncio.sleep(0, result=item)
+        if self.error is not None:
+            raise self.error
+        raise StopAsyncIteration
+
+
+@skipIf(sys.version_info < (3, 6), 'asyncio streaming needs Python 3.6+')
+class AsyncConvertStreamTest(TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def _collect(self, stream, results):
+        while True:
+            try:
+                results.append(self.loop.run_until_complete(
+                    stream.__anext__()))
+            except StopAsyncIteration:
+                return results
+
+    def test_stream(self):
+        """Test that strings are converted in order across batches."""
+        texts = ['fooBar{}'.format(i) for i in range(1000)]
+        stream = case_conversion.aconvert_stream(
+            _AsyncSource(texts), 'snake', batch_size=64, buffer_size=16)
+        self.assertEqual(self._collect(stream, []),
+                         case_conversion.convert_many(texts, 'snake'))
+
+    def test_executor(self):
+        """Test that batches can be converted in an executor."""
+        texts = ['HTTPError{}'.format(i) for i in range(300)]
+        with ThreadPoolExecutor(1) as executor:
+            stream = case_conversion.aconvert_stream(
+                _AsyncSource(texts), 'const', acronyms=ACRONYMS,
+                executor=executor, offload_threshold=1)
+            self.assertEqual(
+                self._collect(stream, []),
+                case_conversion.convert_many(texts, 'const', ACRONYMS))
+
+    def test_source_error(self):
+        """Test that a source error is raised after the items before it."""
+        stream = case_conversion.aconvert_stream(
+            _AsyncSource(['fooBar'], ValueError('boom')), 'snake')
+        results = []
+        self.assertRaises(ValueError, self._collect, stream, results)
+        self.assertEqual(results, ['foo_bar'])
+
+    def test_source_cancelled(self):
+        """Test that a cancelled source ends the stream instead of hanging."""
+        stream = case_conversion.aconvert_stream(
+            _AsyncSource(['fooBar'], asyncio.CancelledError()), 'snake')
+        results = []
+        self.assertRaises(asyncio.CancelledError, self._collect, stream,
+                          results)
+        self.assertEqual(results, ['foo_bar'])
+
+
+class ParseStatsTest(TestCase):
+    def setUp(self):
+        self.parsed = []
+        case_parse.enable_stats()
+        case_parse.add_parse_hook(self._hook)
+
+    def tearDown(self):
+        case_parse.remove_parse_hook(self._hook)
+        case_parse.disable_stats()
+
+    def _hook(self, string, result, seconds):
+        self.parsed.append((string, result))
+
+    def test_stats(self):
+        """Test call counts, length buckets and acronym matches."""
+        for text in ('', 'fooBar', 'fooHTTPBar', 'HTTP_HTTP_STATUS'):
+            case_parse.parse_case(text, ACRONYMS)
+        stats = case_parse.stats()
+        self.assertEqual(stats['calls'], 4)
+        self.assertEqual(stats['lengths'], {0: 1, 8: 1, 16: 2})
+        self.assertEqual(stats['acronym_matches'], 3)
+        self.assertIsNone(stats['cache'])
+        self.assertEqual(sorted(stats['time']),
+                         ['case', 'group', 'normalize', 'separate', 'total'])
+        self.assertTrue(all(t >= 0 for t in stats['time'].values()))
+
+        case_parse.reset_stats()
+        self.assertEqual(case_parse.stats()['calls'], 0)
+
+    def test_cache_ratio(self):
+        """Test that the parse cache hit ratio is reported."""
+        case_parse.set_cache_size(10)
+        try:
+            for _ in range(4):
+                case_parse.parse_case('fooBar')
+            self.assertEqual(case_parse.stats()['cache'],
+                             {'hits': 3, 'misses': 1, 'hit_ratio': 0.75})
+        finally:
+            case_parse.set_cache_size(None)
+
+    def test_hooks(self):
+        """Test that hooks see each parse, only while enabled."""
+        case_parse.parse_case('fooBar')
+        self.assertEqual(self.parsed, [('fooBar', (['Foo', 'Bar'], 'camel',
+                                                   ''))])
+        case_parse.disable_stats()
+        case_parse.parse_case('fooBar')
+        self.assertIsNone(case_parse.stats())
+        self.assertEqual(len(self.parsed), 1)
+
+
+class RewriteIdentifiersTest(TestCase):
+    SOURCE = (u'def get_user(request_id, http_client):\n'
+              u'    return http_client.fetch_user(request_id, 42, x2y)\n'
+              u'# 123abc fóo_bar\n')
+
+    def test_text(self):
+        """Test rewriting identifiers in a string."""
+        self.assertEqual(
+            case_conversion.rewrite_identifiers(
+                self.SOURCE, 'camel', acronyms=ACRONYMS,
+                predicate=lambda identifier: identifier != 'def'),
+            u'def getUser(requestId, httpClient):\n'
+            u'    return httpClient.fetchUser(requestId, 42, x2y)\n'
+            u'# 123abc fóoBar\n')
+
+    @parameterized.expand([(str(size), size) for size in (1, 2, 5, 4096)])
+    def test_chunked(self, _, chunk_size):
+        """Test that identifiers cut by chunk boundaries are rewritten."""
+        out = io.StringIO()
+        result = case_conversion.rewrite_identifiers(
+            io.StringIO(self.SOURCE), 'const', out=out, chunk_size=chunk_size)
+        self.assertIsNone(result)
+        self.assertEqual(out.getvalue(), case_conversion.rewrite_identifiers(
+            self.SOURCE, 'const'))
+
+    @parameterized.expand([(str(size), size) for size in (7, 4096, 5000)])
+    def test_long_runs(self, _, chunk_size):
+        """Test that over-long runs of word characters are copied as is."""
+        blob = u'aB_' * 2000
+        source = u'foo_bar = "%s" + baz_qux\n%s x_y' % (blob, u'1' + blob)
+        expected = u'fooBar = "%s" + bazQux\n%s xY' % (blob, u'1' + blob)
+        self.assertEqual(case_conversion.rewrite_identifiers(source, 'camel'),
+                         expected)
+        out = io.StringIO()
+        case_conversion.rewrite_identifiers(
+            io.StringIO(source), 'camel', out=out, chunk_size=chunk_size)
+        self.assertEqual(out.getvalue(), expected)
+
+
+class PersistentCacheTest(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'cache.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _stored(self, acronyms=None):
+        """Return the entries loaded from the file by a new cache."""
+        cache = case_conversion.PersistentCache(self.path, acronyms)
+        with cache:
+            cache._load()
+            return dict(cache._results)
+
+    def test_round_trip(self):
+        """Test that conversions are stored and reloaded."""
+        with case_conversion.PersistentCache(self.path, ACRONYMS,
+                                             flush_size=2) as cache:
+            self.assertEqual(cache.convert('fooHTTPBar', 'snake'),
+                             'foo_http_bar')
+            self.assertEqual(cache.convert('fooHTTPBar', 'camelcase'),
+                             'fooHTTPBar')
+            self.assertEqual(cache.convert('fooHTTPBar', 'snakecase'),
+                             'foo_http_bar')
+            self.assertEqual(cache.convert('foo', 'const'), 'FOO')
+        self.assertEqual(self._stored(ACRONYMS), {
+            (styles.get('snakecase'), 'fooHTTPBar'): 'foo_http_bar',
+            (styles.get('camelcase'), 'fooHTTPBar'): 'fooHTTPBar',
+            (styles.get('constcase'), 'foo'): 'FOO',
+        })
+
+    def test_restyled(self):
+        """Test that a style declared again differently isn't served stale."""
+        # As if another run had declared snakecase with other rules.
+        other = styles.Style('snakecase', '-', 'lower', 'lower', False)
+        with case_conversion.PersistentCache(self.path) as cache:
+            cache.convert('foo', 'snake')
+            cache._pending.append((json.dumps(other), 'fooBar', 'foo-bar'))
+        with case_conversion.PersistentCache(self.path) as cache:
+            self.assertEqual(cache.convert('fooBar', 'snake'), 'foo_bar')
+        self.assertEqual(len(self._stored()), 3)
+
+    def test_bounded_memory(self):
+        """Test that at most cache_size conversions are held in memory."""
+        with case_conversion.PersistentCache(self.path, cache_size=2,
+                                             flush_size=3) as cache:
+            for text in ('fooBar', 'fooBaz', 'fooQux', 'fooBar', 'barFoo'):
+                self.assertEqual(cache.convert(text, 'snake'),
+                                 case_conversion.snakecase(text))
+                self.assertTrue(len(cache._results) <= 2)
+        self.assertEqual(len(self._stored()), 4)
+
+    def test_flush_after_close(self):
+        """Test that a conversion recorded after close isn't flushed."""
+        cache = case_conversion.PersistentCache(self.path)
+        cache.convert('fooBar', 'snake')
+        cache.close()
+        cache._pending.append((json.dumps(styles.get('snakecase')), 'fooBaz',
+                               'foo_baz'))
+        cache.flush()
+        self.assertEqual(self._stored(),
+                         {(styles.get('snakecase'), 'fooBar'): 'foo_bar'})
+
+    def test_invalidation(self):
+        """Test that changed acronyms or version empty the cache."""
+        with case_conversion.PersistentCache(self.path, ACRONYMS) as cache:
+            cache.convert('fooHTTPBar', 'snake')
+        self.assertEqual(len(self._stored(ACRONYMS)), 1)
+        self.assertEqual(self._stored(['HTTP', 'JSON']), {})
+
+        with case_conversion.PersistentCache(self.path) as cache:
+            cache.convert('fooBar', 'snake')
+        persistent = case_conversion.persistent
+        version = persistent.__version__
+        persistent.__version__ = version + '.dev0'
+        try:
+            self.assertEqual(self._stored(), {})
+        finally:
+            persistent.__version__ = version
+
+
+SEPARATE_WORDS_VALUES = [
+    '', '_', 'foo', 'FOO', 'fooBar', 'FooBar', 'foo_bar', 'FOO_BAR',
+    'foo__bar--baz', '_foo_', 'fooHTTPBar', 'HTTPError', 'a1B2c3',
+    'foo bar.baz/qux', u'fóoBarString', u'FÓO_BAR', u'foo中文Bar', u'ǅemal',
+]
+
+
+class SeparateWordsTest(TestCase):
+    @parameterized.expand([(repr(v), v) for v in SEPARATE_WORDS_VALUES])
+    def test_matches_legacy(self, _, value):
+        """
+        Test that the single-pass tokenizer segments strings exactly like the
+        original character-by-character loop.
+        """
+        self.assertEqual(case_parse._separate_words(value),
+                         case_parse._separate_words_legacy(value))
+
+
+class CharClassTest(TestCase):
+    def _regex_class(self, char):
+        if case_parse.UPPER.match(char):
+            return case_parse.CLASS_UPPER
+        if case_parse.NOTSEP.match(char):
+            return case_parse.CLASS_NOTSEP
+        self.assertTrue(case_parse.SEP.match(char))
+        return case_parse.CLASS_SEP
+
+    def test_matches_regex_classes(self):
+        """Test that the table agrees with the regex classes everywhere."""
+        table = case_parse._char_table()
+        self.assertEqual(len(table), 0x10000)
+        mismatches = [code for code in range(0x10000)
+                      if table[code] != self._regex_class(unichr(code))]
+        self.assertEqual(mismatches, [])
+
+    @parameterized.expand([(hex(ord(c)), c) for c in
+                           u'\U0001d400\U0001d41a\U0001d7ce\U0001f600'
+                           if len(c) == 1])
+    def test_higher_planes(self, _, char):
+        """Test characters outside the table (math letters, emoji)."""
+        self.assertEqual(case_parse._char_class(char),
+                         self._regex_class(char))
+
+
+class BinaryInputTest(TestCase):
+    @parameterized.expand(
+        [(name + '2' + case + '_' + kind.__name__, case, value, kind)
+         for case in CASES + CASES_PRESERVE
+         for name, value in VALUES_ACRONYM.items()
+         for kind in (bytes, bytearray, memoryview)])
+    def test_converters(self, _, case, value, kind):
+        """Test that binary input is converted like text, into bytes."""
+        data = kind(value.encode('ascii'))
+        expected = getattr(case_conversion, case)(value, ACRONYMS)
+        result = getattr(case_conversion, case)(data, ACRONYMS)
+        self.assertTrue(isinstance(result, bytes))
+        self.assertEqual(result, expected.encode('ascii'))
+        converter = case_conversion.CaseConverter(ACRONYMS)
+        self.assertEqual(getattr(converter, case)(data), result)
+
+    def test_parse_case(self):
+        """Test that parse_case returns words and separator as bytes."""
+        for data in (b'fooHTTP_bar', bytearray(b'fooHTTP_bar'),
+                     memoryview(b'fooHTTP_bar')):
+            self.assertEqual(case_parse.parse_case(data, ACRONYMS),
+                             ([b'Foo', b'HTTP', b'Bar'], 'mixed', b'_'))
+        self.assertEqual(case_parse.parse_case(b'foo'),
+                         ([b'Foo'], 'lower', b''))
+
+    def test_is_case(self):
+        """Test that is_case accepts binary input."""
+        self.assertTrue(case_conversion.is_case(b'foo_bar', 'snake'))
+        self.assertFalse(case_conversion.is_case(bytearray(b'fooBar'),
+                                                 'snake'))
+
+    @parameterized.expand([(case, case) for case in CASES + CASES_PRESERVE])
+    def test_compile_converter(self, _, case):
+        """Test compiled converters built for binary input."""
+        convert = case_conversion.compile_converter(case, ACRONYMS,
+                                                    binary=True)
+        for name, value in VALUES_ACRONYM.items():
+            expected = getattr(case_conversion, case)(value, ACRONYMS)
+            for kind in (bytes, bytearray, memoryview):
+                self.assertEqual(convert(kind(value.encode('ascii'))),
+                                 expected.encode('ascii'))
+
+    def test_detect_case(self):
+        """Test that detect_case accepts binary input."""
+        for data in (b'fooBar', bytearray(b'FOO_BAR'), memoryview(b'foo')):
+            self.assertEqual(case_conversion.detect_case(data),
+                             case_conversion.detect_case(
+                                 bytes(data).decode('ascii')))
+
+    def test_non_ascii(self):
+        """Test that non-ASCII binary input is rejected."""
+        self.assertRaises(UnicodeDecodeError, case_conversion.snakecase,
+                          u'f\xf3\xf3Bar'.encode('utf-8'))
+        self.assertRaises(UnicodeDecodeError, case_parse.parse_case,
+                          memoryview(b'\xff'))
+
+
+class AcronymMatcherTest(TestCase):
+    def test_first_listed_wins(self):
+        """
+        Test that earlier acronyms take precedence over overlapping later
+        ones.
+        """
+        matcher = case_parse.AcronymMatcher(['BC', 'AB'])
+        self.assertEqual(matcher.find('ABC'), [(0, 1), (1, 3)])
+        matcher = case_parse.AcronymMatcher(['AB', 'BC'])
+        self.assertEqual(matcher.find('ABC'), [(0, 2), (2, 3)])
+
+    def test_repeated_acronym(self):
+        """Test that every non-overlapping instance of an acronym is found."""
+        matcher = case_parse.AcronymMatcher(['aa'])
+        self.assertEqual(matcher.find('AAAAA'),
+                         [(0, 2), (2, 4), (4, 5)])
+
+    def test_matcher_as_acronyms(self):
+        """Test that a prebuilt matcher can be passed in place of a list."""
+        matcher = case_parse.AcronymMatcher(ACRONYMS)
+        self.assertEqual(case_conversion.snakecase('fooHTTPBarString',
+                                                   acronyms=matcher),
+                         'foo_http_bar_string')
+
+    def test_invalid_acronym(self):
+        """Test that invalid acronyms are rejected."""
+        self.assertRaises(case_parse.InvalidAcronymError,
+                          case_parse.AcronymMatcher, ['HT-TP'])
+
 
 if __name__ == '__main__':
     from unittest import main